@@ -1,10 +1,14 @@
 import os
+import sys
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 from scipy.stats import skew, kurtosis
 import numpy as np 
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from utils.artifacts import read_artifact
+
 def run_eda(input_path, output_dir):
     """
     Exploratory Data Analysis (EDA) untuk UANG_PINJAMAN.
@@ -14,7 +18,7 @@ def run_eda(input_path, output_dir):
     - Analisis temporal (jika ada TGL_JATUH_TEMPO)
     """
     # Load data
-    df = pd.read_csv(input_path)
+    df = read_artifact(input_path)
 
     print(f"[INFO] Kolom tersedia: {df.columns.tolist()}")
     print(f"[INFO] Total record: {len(df)}")
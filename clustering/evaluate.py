@@ -1,11 +1,15 @@
 # evaluate.py
 import os
+import sys
 import pandas as pd
 from sklearn.metrics import silhouette_score, calinski_harabasz_score, davies_bouldin_score
 import matplotlib.pyplot as plt
 import seaborn as sns
 import numpy as np
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from utils.artifacts import read_artifact
+
 def run_evaluation(input_path, output_dir):
     """
     Evaluasi hasil clustering dengan internal metrics:
@@ -16,7 +20,7 @@ def run_evaluation(input_path, output_dir):
     - Interpretasi hasil untuk business context PT Pegadaian
     """
     # Load dataset hasil clustering
-    df = pd.read_csv(input_path)
+    df = read_artifact(input_path)
 
     print(f"[INFO] Kolom tersedia: {df.columns.tolist()}")
     print(f"[INFO] Total record: {len(df)}")
@@ -1,9 +1,12 @@
 import os
-import pandas as pd
+import sys
 import joblib
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from utils.artifacts import read_artifact, save_artifact
+
 def predict_clustering(input_path, model_path, scaler_path, output_dir):
     """
     Prediksi cluster dengan model KMeans yang sudah dilatih:
@@ -13,7 +16,7 @@ def predict_clustering(input_path, model_path, scaler_path, output_dir):
     - Visualisasi: distribusi cluster hasil prediksi
     """
     # Load data
-    df = pd.read_csv(input_path)
+    df = read_artifact(input_path)
 
     print(f"[INFO] Kolom tersedia: {df.columns.tolist()}")
     print(f"[INFO] Total record: {len(df)}")
@@ -63,7 +66,7 @@ def predict_clustering(input_path, model_path, scaler_path, output_dir):
     # Simpan hasil prediksi
     os.makedirs(output_dir, exist_ok=True)
     clustered_path = os.path.join(output_dir, "predicted_clusters.csv")
-    df.to_csv(clustered_path, index=False, encoding="utf-8-sig")
+    clustered_path = save_artifact(df, clustered_path, kind="clustered")
 
     # Simpan cluster summary
     cluster_summary.to_csv(os.path.join(output_dir, "predicted_cluster_summary.csv"))
@@ -1,11 +1,14 @@
 import os
-import pandas as pd
+import sys
 from sklearn.preprocessing import StandardScaler
 import joblib
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
 DATASET_DIR = os.path.join(BASE_DIR, "output", "dataset_clustering")
 
+sys.path.append(BASE_DIR)
+from utils.artifacts import read_artifact, save_artifact, resolve_artifact
+
 # Folder output
 PREPROCESS_DIR = os.path.join(BASE_DIR, "output", "clustering", "preprocessing")
 MODEL_DIR = os.path.join(BASE_DIR, "output", "clustering", "model")
@@ -16,11 +19,11 @@ os.makedirs(MODEL_DIR, exist_ok=True)
 def run_preprocessing():
     dataset_path = os.path.join(DATASET_DIR, "dataset.csv")
     
-    if not os.path.exists(dataset_path):
+    if not resolve_artifact(dataset_path):
         raise FileNotFoundError(f"❌ File {dataset_path} tidak ditemukan!")
 
     # Load dataset
-    df = pd.read_csv(dataset_path, dtype=str)
+    df = read_artifact(dataset_path, as_str=True)
 
     # Normalisasi nama kolom ke uppercase
     df.columns = [c.upper() for c in df.columns]
@@ -104,7 +107,7 @@ def run_preprocessing():
     # === SIMPAN HASIL ===
     # 1. Simpan hasil preprocessing
     out_path = os.path.join(PREPROCESS_DIR, "preprocessed.csv")
-    df.to_csv(out_path, index=False, encoding="utf-8-sig")
+    out_path = save_artifact(df, out_path, kind="preprocessed")
 
     # 2. Simpan scaler
     scaler_path = os.path.join(MODEL_DIR, "scaler.pkl")
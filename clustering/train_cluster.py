@@ -1,10 +1,13 @@
 import os
-import pandas as pd
+import sys
 from sklearn.cluster import KMeans
 import joblib
 import matplotlib.pyplot as plt
 import seaborn as sns
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from utils.artifacts import read_artifact, save_artifact
+
 def run_clustering(input_path, output_dir, n_clusters=3, random_state=42):
     """
     Training model KMeans clustering:
@@ -13,7 +16,7 @@ def run_clustering(input_path, output_dir, n_clusters=3, random_state=42):
     - Visualisasi: cluster distribution & scatter plot
     """
     # Load data
-    df = pd.read_csv(input_path)
+    df = read_artifact(input_path)
 
     print(f"[INFO] Kolom tersedia: {df.columns.tolist()}")
     print(f"[INFO] Total record: {len(df)}")
@@ -60,7 +63,7 @@ def run_clustering(input_path, output_dir, n_clusters=3, random_state=42):
 
     # === Simpan clustered dataset ===
     clustered_path = os.path.join(output_dir, "clustered_data.csv")
-    df.to_csv(clustered_path, index=False, encoding="utf-8-sig")
+    clustered_path = save_artifact(df, clustered_path, kind="clustered")
 
     # === Simpan model KMeans ===
     model_path = os.path.join(output_dir, "kmeans_model.pkl")
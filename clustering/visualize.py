@@ -1,11 +1,15 @@
 # visualize.py
 import os
+import sys
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
 import datetime
 import numpy as np
 
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+from utils.artifacts import read_artifact
+
 def run_visualization(input_path, output_dir_vis, output_dir_sum):
     """
     Visualisasi hasil clustering untuk PT Pegadaian:
@@ -19,7 +23,7 @@ def run_visualization(input_path, output_dir_vis, output_dir_sum):
       * Top nasabah berisiko tinggi (jatuh tempo terdekat + nominal besar)
     """
     # Load data
-    df = pd.read_csv(input_path)
+    df = read_artifact(input_path)
 
     print(f"[INFO] Kolom tersedia: {df.columns.tolist()}")
     print(f"[INFO] Total record: {len(df)}")
@@ -1,17 +1,18 @@
 import streamlit as st
 import json, os, time
+from utils.config_loader import CONFIG_DIR, TEMPLATES_PATH
 
 st.title("Template Message")
 st.markdown("### Langkah 2: Buat Template Pesan untuk Nasabah")
 
-template_path = os.path.join("config", "templates.json")
+template_path = TEMPLATES_PATH
 
 # Load existing templates
 if os.path.exists(template_path):
     with open(template_path, "r", encoding="utf-8") as f:
         templates = json.load(f)
 else:
-    os.makedirs("config", exist_ok=True)
+    os.makedirs(CONFIG_DIR, exist_ok=True)
     templates = {"jatuh_tempo": "", "kredit_bermasalah": ""}
 
 # Info box
@@ -108,7 +109,7 @@ with col1:
                 templates[doc_type.replace(" ", "_")] = st.session_state.custom_text
                 
                 # Ensure config directory exists
-                os.makedirs("config", exist_ok=True)
+                os.makedirs(CONFIG_DIR, exist_ok=True)
                 
                 with open(template_path, "w", encoding="utf-8") as f:
                     json.dump(templates, f, indent=2, ensure_ascii=False)
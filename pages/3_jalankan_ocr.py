@@ -1,5 +1,6 @@
 import streamlit as st
 import pipeline
+from utils.config_loader import TEMPLATES_PATH
 import os
 import time
 
@@ -37,7 +38,7 @@ with col3:
     st.metric("📄 Total", total_files)
 
 # Template status
-template_path = os.path.join("config", "templates.json")
+template_path = TEMPLATES_PATH
 template_exists = os.path.exists(template_path)
 
 col1, col2 = st.columns(2)
@@ -130,6 +131,35 @@ st.warning("""
 - Pastikan koneksi internet stabil (untuk download model OCR pertama kali)
 """)
 
+# Lanjutkan run yang terputus (halaman yang sudah di-OCR diambil dari journal)
+resume_run = st.checkbox(
+    "🔁 Lanjutkan proses sebelumnya yang terputus",
+    value=False,
+    help="Halaman yang sudah selesai di-OCR pada run sebelumnya tidak diproses ulang."
+)
+
+# Pengaturan OCR lanjutan (default sama dengan ocr_extractor.OCR_MODE / OCR_WORKERS)
+OCR_MODE_LABELS = {
+    "full": "Full page (default)",
+    "grid": "Grid per sel tabel (jatuh tempo)",
+    "batched": "Batched (beberapa halaman sekaligus)",
+    "adaptive": "Adaptive (resolusi rendah + re-OCR box ragu)",
+}
+with st.expander("⚙️ Pengaturan OCR Lanjutan"):
+    ocr_mode = st.selectbox(
+        "Mode OCR",
+        list(OCR_MODE_LABELS),
+        index=list(OCR_MODE_LABELS).index(pipeline.ocr_extractor.OCR_MODE),
+        format_func=OCR_MODE_LABELS.get,
+    )
+    ocr_workers = st.number_input(
+        "Jumlah proses OCR",
+        min_value=1,
+        max_value=max(1, os.cpu_count() or 1),
+        value=pipeline.ocr_extractor.OCR_WORKERS,
+        help="Lebih dari 1 → OCR dibagi ke beberapa proses (tiap proses memuat model sendiri, butuh RAM lebih)."
+    )
+
 # Process button
 if st.button("▶️ MULAI PROSES OCR", type="primary", use_container_width=True):
     
@@ -162,7 +192,8 @@ if st.button("▶️ MULAI PROSES OCR", type="primary", use_container_width=True
         update_progress(0, "Memulai pipeline...")
         
         # Run pipeline
-        pipeline.run_pipeline_all(update_progress=update_progress)
+        pipeline.run_pipeline_all(update_progress=update_progress, resume=resume_run,
+                                  workers=int(ocr_workers), ocr_mode=ocr_mode)
         
         # Success
         elapsed_time = time.time() - start_time
@@ -2,6 +2,7 @@ import streamlit as st
 import os
 import pandas as pd
 from io import BytesIO
+from utils.artifacts import read_artifact, list_artifacts
 
 OUTPUT_DIR = "output"
 parsed_dir = os.path.join(OUTPUT_DIR, "parsed_output") 
@@ -33,8 +34,8 @@ with tab1:
     st.markdown("### Data yang Sudah Diproses")
     
     if os.path.exists(parsed_dir):
-        # Cari semua file CSV di folder parsed
-        all_files = [f for f in os.listdir(parsed_dir) if f.endswith(".csv")]
+        # Cari semua file artefak (CSV / Parquet) di folder parsed
+        all_files = list_artifacts(parsed_dir)
         
         if all_files:
             st.info(f"📁 Ditemukan {len(all_files)} file parsed")
@@ -43,7 +44,7 @@ with tab1:
             file_path = os.path.join(parsed_dir, selected_file)
             
             try:
-                df = pd.read_csv(file_path)
+                df = read_artifact(file_path)
                 
                 # ✅ FIX: Convert ALL possible numeric column variations
                 numeric_cols = [
@@ -82,7 +83,7 @@ with tab1:
                     st.download_button(
                         label="📥 Download CSV",
                         data=csv,
-                        file_name=f"{selected_file}",
+                        file_name=f"{os.path.splitext(selected_file)[0]}.csv",
                         mime="text/csv",
                         use_container_width=True
                     )
@@ -168,7 +169,7 @@ with tab3:
     st.caption("Hasil mentah dari OCR sebelum diproses dan dibersihkan")
     
     if os.path.exists(raw_ocr_dir):
-        files = [f for f in os.listdir(raw_ocr_dir) if f.endswith(".csv") and "REVIEW" not in f.upper()]
+        files = [f for f in list_artifacts(raw_ocr_dir) if "REVIEW" not in f.upper()]
         
         if files:
             st.info(f"📁 Ditemukan {len(files)} file raw OCR")
@@ -177,7 +178,7 @@ with tab3:
             file_path = os.path.join(raw_ocr_dir, selected_file)
             
             try:
-                df = pd.read_csv(file_path)
+                df = read_artifact(file_path)
                 
                 col1, col2 = st.columns(2)
                 with col1:
@@ -192,7 +193,7 @@ with tab3:
                 st.download_button(
                     label="📥 Download Raw OCR (CSV)",
                     data=csv,
-                    file_name=selected_file,
+                    file_name=f"{os.path.splitext(selected_file)[0]}.csv",
                     mime="text/csv",
                     use_container_width=True
                 )
@@ -1,6 +1,7 @@
 import streamlit as st
 import os, glob, pandas as pd
 from PIL import Image
+from utils.artifacts import read_artifact, resolve_artifact
 
 OUTPUT_DIR = "output"
 
@@ -11,10 +12,9 @@ possible_files = [
     os.path.join(OUTPUT_DIR, "clustering", "model", "clustered_data.csv"),
     os.path.join(OUTPUT_DIR, "clustering", "model", "predicted_clusters.csv")
 ]
-clustered_file = None
 for f in possible_files:
-    if os.path.exists(f):
-        clustered_file = f
+    clustered_file = resolve_artifact(f)
+    if clustered_file:
         break
 
 summary_dir = os.path.join(OUTPUT_DIR, "clustering", "summary")
@@ -35,7 +35,7 @@ if clustered_file is None or not os.path.exists(clustered_file):
     st.stop()
 
 # Load data
-clustered_df = pd.read_csv(clustered_file)
+clustered_df = read_artifact(clustered_file)
 
 # === SECTION 1: STATISTIK CEPAT ===
 st.header("📈 Statistik Cepat")
@@ -13,6 +13,7 @@ import utils.ocr_extractor as ocr_extractor
 import utils.postprocessing as postprocessing
 import utils.cleaning_std as cleaning_std
 import utils.parsers as parsers
+from utils.artifacts import to_str_frame, save_artifact
 
 import clustering.dataset as dataset
 import clustering.preprocessing as preprocessing
@@ -77,18 +78,27 @@ def clustering_step(input_path, model_dir):
 
 
 # --- OCR Helper untuk pipeline ---
-def run_ocr_for_doc_type(doc_type: str):
+def run_ocr_for_doc_type(doc_type: str, images=None, workers=ocr_extractor.OCR_WORKERS,
+                         ocr_mode=ocr_extractor.OCR_MODE, resume=False):
     """
     Wrapper untuk menjalankan OCR extraction berdasarkan doc_type.
     Menggunakan fungsi process_doc_type dari ocr_extractor.
+    images: list (nama_file, array) jika preprocessing dijalankan in-memory.
+    workers > 1: OCR multi-proses, Reader di-load oleh masing-masing worker.
+    ocr_mode: "full" (deteksi satu halaman), "grid" (per sel tabel, jatuh_tempo),
+    "batched" (readtext_batched per kelompok halaman), atau "adaptive"
+    (pass resolusi rendah + re-OCR box ber-confidence rendah).
+    resume=True: lanjutkan run yang terputus, halaman di journal tidak di-OCR ulang.
     """
     print(f"[INFO] Memulai OCR extraction untuk {doc_type}...")
     
-    # Inisialisasi reader
-    reader = ocr_extractor.get_reader()
+    # Inisialisasi reader (mode multi-proses tidak butuh reader di proses utama)
+    reader = ocr_extractor.get_reader() if workers <= 1 else None
     
     # Proses OCR
-    df, out_path = ocr_extractor.process_doc_type(reader, doc_type)
+    df, out_path = ocr_extractor.process_doc_type(reader, doc_type, images=images,
+                                                  workers=workers, ocr_mode=ocr_mode,
+                                                  resume=resume)
     
     if df is not None:
         print(f"[INFO] OCR {doc_type} selesai: {len(df)} records extracted")
@@ -98,31 +108,81 @@ def run_ocr_for_doc_type(doc_type: str):
         return None, None
 
 
+# --- Post-processing fused (tanpa CSV perantara) ---
+def run_postprocess_fused(doc_type: str, df_raw, write_artifacts=False):
+    """
+    Postprocess → cleaning → parsing dalam satu proses, DataFrame diteruskan langsung.
+    Tiap tahap tetap menerima kolom string (to_str_frame = semantik CSV dtype=str).
+    write_artifacts=True: simpan juga CSV postprocessed & cleaned seperti mode biasa.
+    Hasil parsed_output & messages selalu ditulis (dipakai clustering & halaman Output).
+    """
+    if df_raw is None or df_raw.empty:
+        print(f"[WARN] Tidak ada data OCR {doc_type} untuk diproses")
+        return None
+
+    stamp = time.strftime("%Y%m%d")
+    df_post = postprocessing.postprocess_dataframe(to_str_frame(df_raw), doc_type)
+    if write_artifacts:
+        out_path = os.path.join(OUTPUT_DIR, "postprocessed", f"{doc_type}_final_{stamp}.csv")
+        save_artifact(df_post, out_path, kind="postprocessed")
+    print(f"[INFO] Postprocessing {doc_type}: {len(df_post)} record")
+
+    df_clean = cleaning_std.clean_postprocessed(to_str_frame(df_post), doc_type)
+    if write_artifacts:
+        out_path = os.path.join(OUTPUT_DIR, "cleaned", f"{doc_type}_clean_{stamp}.csv")
+        save_artifact(df_clean, out_path, kind="cleaned")
+    print(f"[INFO] Cleaning {doc_type}: {len(df_clean)} record")
+
+    return parsers.parse_dataframe(to_str_frame(df_clean), doc_type)
+
+
 # --- Pipeline per PDF ---
-def run_pipeline_per_pdf(pdf_path: str, doc_type: str):
+def run_pipeline_per_pdf(pdf_path: str, doc_type: str, in_memory=False, resume=False, fused=False,
+                         workers=ocr_extractor.OCR_WORKERS, ocr_mode=ocr_extractor.OCR_MODE):
     print("\n==============================")
     print(f"🚀 Memproses PDF: {pdf_path} (type={doc_type})")
 
     # Step 0: Preprocessing PDF → Images
+    # in_memory=True → gambar tidak ditulis ke disk, array langsung diteruskan ke OCR
     print("\n📌 Step 0: Preprocessing PDF → Images")
     try:
         image_files = preprocessing_ocr.run_preprocessing(
             pdf_path,
             doc_type,
             base_output_dir=BASE_DIR,
-            keep_aspect_ratio=True
+            keep_aspect_ratio=True,
+            write_images=not in_memory
         )
         print(f"[INFO] {len(image_files)} gambar berhasil dibuat untuk OCR")
     except Exception as e:
         print(f"[ERROR] Gagal preprocessing PDF: {e}")
         return
 
+    images = image_files if in_memory else None
+
+    # fused=True → hasil OCR (DataFrame) langsung diteruskan ke postprocess/clean/parse
+    ocr_result = {}
+
+    def ocr_step():
+        ocr_result["df"], _ = run_ocr_for_doc_type(doc_type, images=images, workers=workers,
+                                                   ocr_mode=ocr_mode, resume=resume)
+
+    if fused:
+        post_steps = [
+            ("Postprocessing + Cleaning + Parsing (fused)",
+             lambda: run_postprocess_fused(doc_type, ocr_result.get("df"))),
+        ]
+    else:
+        post_steps = [
+            ("Postprocessing", lambda: postprocessing.run_postprocessing_wrapper(OUTPUT_DIR)),
+            ("Cleaning", lambda: cleaning_std.run_cleaning(OUTPUT_DIR)),
+            ("Parsing", lambda: parsers.parse_document(doc_type)),
+        ]
+
     # Steps pipeline utama
     steps = [
-        ("OCR Extractor", lambda: run_ocr_for_doc_type(doc_type)),
-        ("Postprocessing", lambda: postprocessing.run_postprocessing_wrapper(OUTPUT_DIR)),
-        ("Cleaning", lambda: cleaning_std.run_cleaning(OUTPUT_DIR)),
-        ("Parsing", lambda: parsers.parse_document(doc_type)),
+        ("OCR Extractor", ocr_step),
+        *post_steps,
         ("Dataset Merge", lambda: dataset.run_dataset()),
         ("Preprocessing", lambda: preprocessing.run_preprocessing()),
         ("EDA", lambda: eda.run_eda(
@@ -157,7 +217,12 @@ def run_pipeline_per_pdf(pdf_path: str, doc_type: str):
     print(f"\n✅ Selesai memproses PDF: {pdf_path}\n")
 
 
-def run_pipeline_all(update_progress=None):
+def run_pipeline_all(update_progress=None, in_memory=False, resume=False, fused=False,
+                     workers=ocr_extractor.OCR_WORKERS, ocr_mode=ocr_extractor.OCR_MODE):
+    """
+    Jalankan seluruh pipeline untuk semua PDF di folder dataset.
+    workers / ocr_mode diteruskan ke run_ocr_for_doc_type (lihat docstring-nya).
+    """
     folder_mapping = {
         "jatuh_tempo": "Dataset Daftar Kredit Jatuh Tempo",
         "kredit_bermasalah": "Dataset Daftar Kredit Bermasalah"
@@ -183,27 +248,38 @@ def run_pipeline_all(update_progress=None):
         print(f"\n===== Preprocessing & OCR untuk: {doc_type} =====")
         
         # Preprocessing semua PDF menjadi images
+        # (in_memory=True → array dikumpulkan & langsung diteruskan ke OCR)
+        images = [] if in_memory else None
         for pdf_file in pdf_files:
             pdf_path = os.path.join(input_dir, pdf_file)
             try:
                 image_files = preprocessing_ocr.run_preprocessing(
-                    pdf_path, doc_type, base_output_dir=BASE_DIR
+                    pdf_path, doc_type, base_output_dir=BASE_DIR,
+                    write_images=not in_memory
                 )
+                if in_memory:
+                    images.extend(image_files)
                 print(f"[INFO] {len(image_files)} images dari {pdf_file}")
             except Exception as e:
                 print(f"[ERROR] Gagal preprocessing {pdf_file}: {e}")
 
         # Jalankan OCR untuk semua images doc_type ini
+        df_raw = None
         try:
-            run_ocr_for_doc_type(doc_type)
+            df_raw, _ = run_ocr_for_doc_type(doc_type, images=images, workers=workers,
+                                             ocr_mode=ocr_mode, resume=resume)
         except Exception as e:
             print(f"[ERROR] Gagal OCR untuk {doc_type}: {e}")
 
         # Jalankan postprocessing, cleaning, parsing untuk doc_type ini
+        # (fused=True → DataFrame diteruskan langsung, tanpa CSV perantara)
         try:
-            postprocessing.run_postprocessing_wrapper(OUTPUT_DIR)
-            cleaning_std.run_cleaning(OUTPUT_DIR)
-            parsers.parse_document(doc_type)
+            if fused:
+                run_postprocess_fused(doc_type, df_raw)
+            else:
+                postprocessing.run_postprocessing_wrapper(OUTPUT_DIR)
+                cleaning_std.run_cleaning(OUTPUT_DIR)
+                parsers.parse_document(doc_type)
         except Exception as e:
             print(f"[ERROR] Gagal post-processing untuk {doc_type}: {e}")
 
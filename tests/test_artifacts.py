@@ -0,0 +1,86 @@
+import io
+import os
+import sys
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+pytest.importorskip("easyocr")
+pytest.importorskip("pdf2image")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import artifacts  # noqa: E402
+
+
+def _frame():
+    return pd.DataFrame({
+        "no_sbg": ["0012345678901234", None, "NA"],
+        "nasabah": ["BUDI", "", "null"],
+        "uang_pinjaman": pd.array([1500000, None, 250000], dtype="Int64"),
+        "skor": [1.5, float("nan"), 3.0],
+        "n": [1, 2, 3],
+        "ok": [True, False, True],
+    })
+
+
+def _via_csv(df):
+    """Acuan: df.to_csv lalu read_csv(dtype=str), seperti transport CSV antar tahap."""
+    return pd.read_csv(io.StringIO(df.to_csv(index=False)), dtype=str)
+
+
+def test_to_str_frame_matches_csv_round_trip():
+    df = _frame()
+    pd.testing.assert_frame_equal(artifacts.to_str_frame(df), _via_csv(df))
+
+
+def test_to_str_frame_ignores_index():
+    df = _frame().set_index(pd.Index([10, 20, 30]))
+    pd.testing.assert_frame_equal(artifacts.to_str_frame(df), _via_csv(df))
+
+
+def test_csv_artifact_round_trip(tmp_path, monkeypatch):
+    monkeypatch.setattr(artifacts, "ARTIFACT_FORMAT", "csv")
+    df = _frame()
+    path = artifacts.save_artifact(df, str(tmp_path / "cleaned" / "x.csv"), kind="cleaned")
+    assert path.endswith(".csv")
+    assert artifacts.resolve_artifact(str(tmp_path / "cleaned" / "x.csv")) == path
+    pd.testing.assert_frame_equal(artifacts.read_artifact(path, as_str=True), _via_csv(df))
+    chunks = list(artifacts.iter_artifact(path, 2, as_str=True))
+    assert [len(c) for c in chunks] == [2, 1]
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), _via_csv(df))
+
+
+def test_parquet_artifact_round_trip(tmp_path, monkeypatch):
+    pytest.importorskip("pyarrow")
+    monkeypatch.setattr(artifacts, "ARTIFACT_FORMAT", "parquet")
+    df = _frame()
+    logical = str(tmp_path / "cleaned" / "x.csv")
+    path = artifacts.save_artifact(df, logical, kind="cleaned")
+    assert path.endswith(".parquet")
+    assert artifacts.resolve_artifact(logical) == path
+    assert artifacts.list_artifacts(str(tmp_path / "cleaned")) == ["x.parquet"]
+
+    expected = artifacts.to_str_frame(df)
+    pd.testing.assert_frame_equal(artifacts.read_artifact(logical, as_str=True), expected)
+    chunks = list(artifacts.iter_artifact(logical, 2, as_str=True))
+    pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
+
+
+def test_artifact_writer_empty_writes_header(tmp_path, monkeypatch):
+    monkeypatch.setattr(artifacts, "ARTIFACT_FORMAT", "csv")
+    path = str(tmp_path / "out" / "empty.csv")
+    with artifacts.ArtifactWriter(path, kind="cleaned", columns=["no_sbg", "nasabah"]) as writer:
+        pass
+    assert writer.rows == 0
+    assert list(artifacts.read_artifact(writer.path, as_str=True).columns) == ["no_sbg", "nasabah"]
+
+
+def test_storage_format_warns_once_without_pyarrow(monkeypatch, capsys):
+    monkeypatch.setattr(artifacts, "ARTIFACT_FORMAT", "parquet")
+    monkeypatch.setattr(artifacts, "parquet_available", lambda: False)
+    monkeypatch.setattr(artifacts, "_fallback_warned", False)
+    assert artifacts.storage_format() == "csv"
+    assert artifacts.storage_format() == "csv"
+    assert capsys.readouterr().out.count("[WARN]") == 1
@@ -0,0 +1,75 @@
+import os
+import sys
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+pytest.importorskip("easyocr")
+pytest.importorskip("pdf2image")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import cleaning_std  # noqa: E402
+from utils.artifacts import read_artifact, save_artifact  # noqa: E402
+
+DOC_TYPE = "jatuh_tempo"
+
+
+def _frame(n, empty_sbg=lambda i: False):
+    """Data postprocessed jatuh_tempo: tanggal berulang (uji stabilitas) + sebagian tanpa tanggal."""
+    return pd.DataFrame({
+        "No_SBG": ["" if empty_sbg(i) else f"12345678901{i:05d}" for i in range(n)],
+        "Nasabah": [f"dr. Nasabah {i % 7}" for i in range(n)],
+        "Telp_HP": [f"62812{i:07d}" for i in range(n)],
+        "Tgl_Jatuh_Tempo": ["" if i % 11 == 0 else f"{1 + i % 28:02d}-{1 + i % 3:02d}-2024"
+                            for i in range(n)],
+        "Uang_Pinjaman": [f"{(i % 50 + 1) * 100_000:,}".replace(",", ".") for i in range(n)],
+    })
+
+
+def _clean_both(tmp_path, df, chunk_rows):
+    in_path = str(tmp_path / "in" / f"{DOC_TYPE}_postprocessed.csv")
+    save_artifact(df, in_path, kind="postprocessed")
+
+    # folder output belum ada → clean_file_streaming harus membuatnya
+    out_path, n_rows = cleaning_std.clean_file_streaming(
+        in_path, str(tmp_path / "cleaned" / "stream.csv"), DOC_TYPE, chunk_rows=chunk_rows)
+    expected_path = save_artifact(
+        cleaning_std.clean_postprocessed(read_artifact(in_path, as_str=True), DOC_TYPE),
+        str(tmp_path / "cleaned" / "memory.csv"), kind="cleaned")
+    return read_artifact(out_path, as_str=True), n_rows, read_artifact(expected_path, as_str=True)
+
+
+def test_streaming_matches_in_memory(tmp_path):
+    got, n_rows, expected = _clean_both(tmp_path, _frame(500), chunk_rows=37)
+    assert n_rows == len(expected) == 500
+    pd.testing.assert_frame_equal(got, expected)
+
+
+def test_streaming_multi_pass_merge_with_empty_runs(tmp_path):
+    # 33 run (> MERGE_FAN_IN); 32 run pertama terfilter habis (No_SBG kosong)
+    df = _frame(3300, empty_sbg=lambda i: i < 3200)
+    got, n_rows, expected = _clean_both(tmp_path, df, chunk_rows=100)
+    assert n_rows == len(expected) == 100
+    pd.testing.assert_frame_equal(got, expected)
+
+
+def test_streaming_all_rows_filtered(tmp_path):
+    df = _frame(3300, empty_sbg=lambda i: True)
+    got, n_rows, expected = _clean_both(tmp_path, df, chunk_rows=100)
+    assert n_rows == 0
+    assert got.empty
+    assert list(got.columns) == list(expected.columns)
+
+
+def test_merge_to_run_empty_runs_keeps_header(tmp_path):
+    columns = [cleaning_std._SORT_KEY, "no_sbg"]
+    runs = []
+    for i in range(3):
+        path = str(tmp_path / f"run_{i}.csv")
+        pd.DataFrame(columns=columns).to_csv(path, index=False)
+        runs.append(path)
+    merged = str(tmp_path / "merged.csv")
+    cleaning_std._merge_to_run(runs, columns, 10, merged)
+    assert list(pd.read_csv(merged).columns) == columns
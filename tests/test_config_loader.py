@@ -0,0 +1,83 @@
+import json
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("pandas")
+pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+pytest.importorskip("easyocr")
+pytest.importorskip("pdf2image")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils.config_loader import CachedJSON  # noqa: E402
+
+
+def _write(path, data):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(data if isinstance(data, str) else json.dumps(data))
+
+
+def test_cached_until_file_changes(tmp_path):
+    path = tmp_path / "templates.json"
+    _write(path, {"jatuh_tempo": "Halo {NASABAH}"})
+    cfg = CachedJSON(str(path))
+
+    first = cfg.get()
+    assert first == {"jatuh_tempo": "Halo {NASABAH}"}
+    assert cfg.get() is first  # tanpa perubahan → objek cache yang sama
+
+    _write(path, {"jatuh_tempo": "Yth. {NASABAH}, jatuh tempo {TGL_JATUH_TEMPO}"})
+    assert cfg.get() == {"jatuh_tempo": "Yth. {NASABAH}, jatuh tempo {TGL_JATUH_TEMPO}"}
+
+
+def test_reload_detects_same_size_rewrite(tmp_path):
+    path = tmp_path / "templates.json"
+    _write(path, {"a": "x"})
+    cfg = CachedJSON(str(path))
+    assert cfg.get() == {"a": "x"}
+
+    _write(path, {"a": "y"})
+    st = os.stat(path)
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000))
+    assert cfg.get() == {"a": "y"}
+
+
+def test_invalid_json_keeps_previous(tmp_path, capsys):
+    path = tmp_path / "templates.json"
+    _write(path, {"a": "x"})
+    cfg = CachedJSON(str(path))
+    cfg.get()
+
+    _write(path, '{"a": ')  # file sedang ditulis
+    assert cfg.get() == {"a": "x"}
+    assert "[WARN]" in capsys.readouterr().out
+
+    _write(path, {"a": "zz"})
+    assert cfg.get() == {"a": "zz"}
+
+
+def test_invalid_json_on_first_load_raises(tmp_path):
+    path = tmp_path / "templates.json"
+    _write(path, "{")
+    with pytest.raises(json.JSONDecodeError):
+        CachedJSON(str(path)).get()
+
+
+def test_missing_file_and_invalidate(tmp_path):
+    path = tmp_path / "templates.json"
+    cfg = CachedJSON(str(path))
+    assert cfg.get() == {}
+
+    _write(path, {"a": "x"})
+    assert cfg.get() == {"a": "x"}
+    os.remove(path)
+    assert cfg.get() == {}
+
+    _write(path, {"a": "x"})
+    first = cfg.get()
+    cfg.invalidate()
+    reloaded = cfg.get()
+    assert reloaded == first
+    assert reloaded is not first
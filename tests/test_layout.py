@@ -0,0 +1,99 @@
+import os
+import re
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+pytest.importorskip("pandas")
+pytest.importorskip("easyocr")
+pytest.importorskip("pdf2image")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import layout, ocr_extractor  # noqa: E402
+
+
+def _box(x, y, w=40, h=12, text="", prob=0.9):
+    return [[x, y], [x + w, y], [x + w, y + h], [x, y + h]], text, prob
+
+
+def _group_lines_loop(ocr_results, y_tol=25):
+    """Implementasi lama _group_lines_by_y (loop per box) sebagai acuan."""
+    if not ocr_results:
+        return []
+    items = []
+    for bbox, text, prob in ocr_results:
+        items.append((min(p[1] for p in bbox), min(p[0] for p in bbox), text))
+    items.sort(key=lambda t: (t[0], t[1]))
+
+    lines, current, last_y = [], [], None
+    for y, x, text in items:
+        if last_y is None or abs(y - last_y) < y_tol:
+            current.append((x, text))
+        else:
+            current.sort(key=lambda t: t[0])
+            lines.append(re.sub(r"\s+", " ", " ".join(t for _, t in current)).strip())
+            current = [(x, text)]
+        last_y = y
+    if current:
+        current.sort(key=lambda t: t[0])
+        lines.append(re.sub(r"\s+", " ", " ".join(t for _, t in current)).strip())
+    return [ln for ln in lines if ln]
+
+
+PAGE = [
+    _box(300, 12, text="JATUH"),
+    _box(10, 10, text="No"),
+    _box(120, 14, text="Nasabah"),
+    _box(10, 60, text="1"),
+    _box(120, 58, text="BUDI  SANTOSO"),
+    _box(400, 62, text="1.500.000"),
+    # rantai: tiap selisih < y_tol tapi total > y_tol → tetap satu baris
+    _box(10, 100, text="a"),
+    _box(60, 120, text="b"),
+    _box(110, 140, text="c"),
+    _box(10, 200, text="   "),
+    # x sama dalam satu baris → urutan y dipertahankan
+    _box(50, 250, text="atas"),
+    _box(50, 255, text="bawah"),
+]
+
+
+def test_line_texts_matches_loop():
+    assert layout.line_texts(PAGE) == _group_lines_loop(PAGE)
+    assert layout.line_texts(PAGE, y_tol=5) == _group_lines_loop(PAGE, y_tol=5)
+    assert ocr_extractor._group_lines_by_y(PAGE) == _group_lines_loop(PAGE)
+
+
+def test_line_texts_random_pages_match_loop():
+    rng = np.random.default_rng(0)
+    for _ in range(50):
+        n = int(rng.integers(1, 40))
+        page = [_box(int(x), int(y), text=f"t{i}")
+                for i, (x, y) in enumerate(zip(rng.integers(0, 500, n), rng.integers(0, 300, n)))]
+        assert layout.line_texts(page) == _group_lines_loop(page)
+
+
+def test_group_lines_structure():
+    lines = layout.group_lines(PAGE[:6])
+    assert [ln["texts"] for ln in lines] == [["No", "Nasabah", "JATUH"], ["1", "BUDI  SANTOSO", "1.500.000"]]
+    assert lines[0]["index"] == [1, 2, 0]
+    assert lines[0]["y_top"] == 10.0
+    assert lines[1]["text"] == "1 BUDI SANTOSO 1.500.000"
+    assert lines[1]["probs"] == pytest.approx([0.9, 0.9, 0.9])
+
+
+def test_empty_input():
+    assert layout.group_lines([]) == []
+    assert layout.line_texts([]) == []
+    assert layout.boxes_to_array([]).shape == (0, 4, 2)
+
+
+def test_assign_columns():
+    lines = layout.group_lines(PAGE[:6] + [_box(130, 60, text="BIN")])
+    table = layout.assign_columns(lines, [0, 100, 350])
+    assert table == [
+        {0: "No", 1: "Nasabah JATUH"},
+        {0: "1", 1: "BUDI  SANTOSO BIN", 2: "1.500.000"},
+    ]
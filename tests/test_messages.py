@@ -0,0 +1,89 @@
+import os
+import sys
+import urllib.parse
+import warnings
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+openpyxl = pytest.importorskip("openpyxl")
+pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+pytest.importorskip("easyocr")
+pytest.importorskip("pdf2image")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import parsers  # noqa: E402
+
+TEMPLATE = "Halo {NASABAH}, pinjaman Rp{UANG_PINJAMAN} jatuh tempo {TGL_JATUH_TEMPO} & mohon dibayar 100%."
+
+FRAME = pd.DataFrame({
+    "nasabah": ["BUDI SANTOSO", "SITI/AMINAH", "ANDI"],
+    "telp_hp": ["81234567890", "", "081298765432"],
+    "tgl_jatuh_tempo": ["05-03-2024", "06-03-2024", "07-03-2024"],
+    "uang_pinjaman": ["1500000", "250000", "12000000"],
+})
+
+
+def _per_row(df, template):
+    return parsers._render_rows(parsers.normalize_column_names(df.copy()), template)
+
+
+def test_compile_template_falls_back_for_format_spec():
+    assert parsers.compile_template("Rp{UANG_PINJAMAN:>10}") is None
+    assert parsers.compile_template("{0}") is None
+    assert parsers.compile_template("A {X} B") == (("A ", "X"), (" B", None))
+
+
+def test_generate_messages_matches_per_row(monkeypatch):
+    monkeypatch.setattr(parsers, "get_template", lambda doc_type: TEMPLATE)
+    got = parsers.generate_messages(FRAME.copy(), "jatuh_tempo")
+
+    # jalur lama: urut uang_pinjaman terbesar lalu str.format per baris
+    order = pd.to_numeric(FRAME["uang_pinjaman"]).sort_values(ascending=False).index
+    expected = _per_row(FRAME.loc[order], TEMPLATE)
+    pd.testing.assert_frame_equal(got, expected)
+    assert got.loc[0, "message"].startswith("Halo ANDI, pinjaman Rp12.000.000")
+    assert got.loc[2, "wa_me"] == ""
+
+
+def test_render_messages_quotes_like_whole_message():
+    df = pd.DataFrame({"A": ["x y", "ä/ü", "100%&?"]})
+    segments = parsers.compile_template("{A} = {A}!")
+    msg, encoded = parsers.render_messages(df, segments)
+    assert list(msg) == [f"{a} = {a}!" for a in df["A"]]
+    assert list(encoded) == [urllib.parse.quote(m) for m in msg]
+
+
+def test_write_messages_excel(tmp_path):
+    df = pd.DataFrame({
+        "nama": ["BUDI", None, "SITI AMINAH BINTI"],
+        "message": ["pesan panjang " * 10, "b", None],
+        "jumlah": [1500000, 2, 3],
+    })
+    path = str(tmp_path / "messages.xlsx")
+    with warnings.catch_warnings():
+        warnings.simplefilter("error", UserWarning)  # warning tabel write_only harus diam
+        parsers.write_messages_excel(df, path, table_name="Pesan")
+
+    wb = openpyxl.load_workbook(path)
+    assert wb.sheetnames == ["Sheet1"]
+    ws = wb["Sheet1"]
+    rows = [list(r) for r in ws.iter_rows(values_only=True)]
+    assert rows == [["nama", "message", "jumlah"],
+                    ["BUDI", "pesan panjang " * 10, 1500000],
+                    [None, "b", 2],
+                    ["SITI AMINAH BINTI", None, 3]]
+    assert ws.column_dimensions["A"].width == len("SITI AMINAH BINTI") + 2
+    assert ws.column_dimensions["B"].width == parsers.MESSAGE_COL_WIDTH
+    assert ws.column_dimensions["C"].width == len("1500000") + 2
+    assert ws["B2"].alignment.wrap_text
+    assert ws.tables["Pesan"].ref == "A1:C4"
+
+
+def test_write_messages_excel_empty_frame(tmp_path):
+    path = str(tmp_path / "messages.xlsx")
+    parsers.write_messages_excel(pd.DataFrame(columns=["message"]), path)
+    ws = openpyxl.load_workbook(path)["Sheet1"]
+    assert [list(r) for r in ws.iter_rows(values_only=True)] == [["message"]]
+    assert ws.tables["DataTable"].ref == "A1:A1"
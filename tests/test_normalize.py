@@ -0,0 +1,73 @@
+import os
+import sys
+
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+pytest.importorskip("easyocr")
+pytest.importorskip("pdf2image")
+pytest.importorskip("openpyxl")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import cleaning_std, parsers  # noqa: E402
+
+NAN = float("nan")
+
+RUPIAH = ["1.500.000", "Rp 2,500,000", "176,104", "99.999", "100.000", " 750000 ",
+          "abc", "", NAN, None, "0", "1,5"]
+DATES = ["05-03-2024", "05/03/2024", "05.03.2024", "2024-03-05", "05-Mar-2024",
+         "5 March 2024", " 05-03-2024 ", "31-02-2024", "bukan tanggal", "", NAN]
+NAMES = ["dr. Budi Santoso", "Hj. SITI, S.Pd", "“Andi”  ir. Wijaya", "Prof. Dr. Rina-Sari",
+         "ＡＢＣ", "budi santoso", "", NAN, None, "Ny. Kartika; M.Kom"]
+NUMBERS = ["1234-5678-9012-3456", " 12 34 ", "SBG 001", "", NAN, None, "abc"]
+HPS = ["+62 812-3456-7890", "0812 3456 7890", "62", "812345", "", NAN, None, "abc"]
+MONEYS = ["1500000", "1.500.000", "000", "Rp 250000", " 12 ", "", NAN, None, "abc", "1500000.0"]
+PHONES = ["81234567890", "081234567890", " 81234 ", "", NAN, None, "+6281234"]
+
+
+def _scalar(func, values):
+    return [func(v) for v in values]
+
+
+def test_normalize_rupiahs_matches_scalar():
+    got = cleaning_std.normalize_rupiahs(pd.Series(RUPIAH, dtype=object))
+    assert [None if pd.isna(v) else int(v) for v in got] == _scalar(cleaning_std.normalize_rupiah, RUPIAH)
+    assert str(got.dtype) == "Int64"
+
+
+def test_normalize_dates_matches_scalar():
+    got = cleaning_std.normalize_dates(pd.Series(DATES, dtype=object))
+    assert list(got) == _scalar(cleaning_std.normalize_date, DATES)
+
+
+def test_normalize_dates_empty_column():
+    got = cleaning_std.normalize_dates(pd.Series(["", NAN], dtype=object))
+    assert list(got) == ["", ""]
+
+
+def test_normalize_names_matches_scalar():
+    cleaning_std._NAME_CACHE.clear()
+    values = pd.Series(NAMES * 2, dtype=object)  # kedua kali lewat memo
+    assert list(cleaning_std.normalize_names(values)) == _scalar(cleaning_std.normalize_name, NAMES * 2)
+
+
+def test_normalize_numbers_matches_scalar():
+    got = cleaning_std.normalize_numbers(pd.Series(NUMBERS, dtype=object))
+    assert list(got) == _scalar(cleaning_std.normalize_number, NUMBERS)
+
+
+def test_normalize_hps_matches_scalar():
+    got = cleaning_std.normalize_hps(pd.Series(HPS, dtype=object))
+    assert list(got) == _scalar(cleaning_std.normalize_hp, HPS)
+
+
+def test_normalize_moneys_matches_scalar():
+    got = parsers.normalize_moneys(pd.Series(MONEYS, dtype=object))
+    assert list(got) == _scalar(parsers.normalize_money, MONEYS)
+
+
+def test_normalize_phones_matches_scalar():
+    got = parsers.normalize_phones(pd.Series(PHONES, dtype=object))
+    assert list(got) == _scalar(parsers.normalize_phone, PHONES)
@@ -0,0 +1,191 @@
+import os
+import sys
+
+import pytest
+
+np = pytest.importorskip("numpy")
+cv2 = pytest.importorskip("cv2")
+pd = pytest.importorskip("pandas")
+pytest.importorskip("easyocr")
+pytest.importorskip("pdf2image")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import ocr_extractor, preprocessing_ocr  # noqa: E402
+
+DOC_TYPE = "jatuh_tempo"
+
+
+def _page(seed):
+    rng = np.random.default_rng(seed)
+    return rng.integers(0, 256, size=(40, 60), dtype=np.uint8)
+
+
+def preprocess(images_dir, pages):
+    """
+    Tiru run_preprocessing: halaman diambil dari cache (shutil.copyfile) bila ada,
+    kalau tidak di-render ulang lalu disimpan ke cache. Keduanya menulis ulang file.
+    """
+    for page_no, img in enumerate(pages, 1):
+        out_path = os.path.join(images_dir, f"file_page{page_no}.png")
+        key = preprocessing_ocr.page_cache_key("pdf-hash", page_no, "normal", {})
+        if preprocessing_ocr.load_cached_page(key, out_path) is None:
+            cv2.imwrite(out_path, img)
+            preprocessing_ocr.store_cached_page(key, page_path=out_path)
+
+
+def workspace_rows(ocr_calls):
+    """Pengganti iter_page_rows_pipelined: catat halaman yang di-OCR, 1 row per halaman."""
+    def fake_rows(reader, doc_type, items, ocr_mode=ocr_extractor.OCR_MODE):
+        for fname, _ in items:
+            ocr_calls.append(fname)
+            yield fname, [{"filename": fname, "No_SBG": fname}]
+    return fake_rows
+
+
+@pytest.fixture
+def workspace(tmp_path, monkeypatch):
+    images_dir = tmp_path / "images" / DOC_TYPE
+    images_dir.mkdir(parents=True)
+    raw_dir = tmp_path / "output" / "raw_ocr"
+    raw_dir.mkdir(parents=True)
+    monkeypatch.setattr(ocr_extractor, "IMAGES_DIR", str(tmp_path / "images"))
+    monkeypatch.setattr(ocr_extractor, "OUTPUT_DIR", str(raw_dir))
+    monkeypatch.setattr(ocr_extractor, "JOURNAL_TEMPLATE", str(raw_dir / "{doc_type}_journal.jsonl"))
+    monkeypatch.setattr(ocr_extractor, "MISSING_NAMES_TEMPLATE",
+                        str(tmp_path / "output" / "missing_names_{doc_type}.csv"))
+    monkeypatch.setattr(preprocessing_ocr, "PAGE_CACHE_DIR", str(tmp_path / "cache" / "preprocessed"))
+
+    ocr_calls = []
+    monkeypatch.setattr(ocr_extractor, "iter_page_rows_pipelined", workspace_rows(ocr_calls))
+    return str(images_dir), ocr_calls
+
+
+def test_resume_after_preprocessing_rerun(workspace):
+    images_dir, ocr_calls = workspace
+    pages = [_page(1), _page(2)]
+
+    preprocess(images_dir, pages)
+    df, _ = ocr_extractor.process_doc_type(None, DOC_TYPE)
+    assert len(ocr_calls) == 2
+    assert len(df) == 2
+
+    # Run berikutnya: preprocessing menulis ulang semua gambar (mtime baru), lalu resume
+    ocr_calls.clear()
+    preprocess(images_dir, pages)
+    df, _ = ocr_extractor.process_doc_type(None, DOC_TYPE, resume=True)
+    assert ocr_calls == []
+    assert sorted(df["filename"]) == ["file_page1.png", "file_page2.png"]
+
+
+def test_resume_reocrs_changed_page(workspace):
+    images_dir, ocr_calls = workspace
+    preprocess(images_dir, [_page(1), _page(2)])
+    ocr_extractor.process_doc_type(None, DOC_TYPE)
+
+    ocr_calls.clear()
+    cv2.imwrite(os.path.join(images_dir, "file_page2.png"), _page(3))
+    df, _ = ocr_extractor.process_doc_type(None, DOC_TYPE, resume=True)
+    assert ocr_calls == ["file_page2.png"]
+    assert len(df) == 2
+
+
+def test_single_page_with_workers_uses_pool(workspace, monkeypatch):
+    images_dir, ocr_calls = workspace
+    preprocess(images_dir, [_page(1)])
+    pool_calls = []
+
+    def fake_parallel(doc_type, items, workers, ocr_mode=ocr_extractor.OCR_MODE, on_page=None):
+        pool_calls.append([fname for fname, _ in items])
+        page_rows = {}
+        for fname, _ in items:
+            page_rows[fname] = [{"filename": fname, "No_SBG": fname}]
+            on_page(fname, page_rows[fname])
+        return page_rows
+
+    monkeypatch.setattr(ocr_extractor, "_process_items_parallel", fake_parallel)
+    # pipeline memberi reader=None saat workers > 1
+    df, _ = ocr_extractor.process_doc_type(None, DOC_TYPE, workers=2)
+    assert pool_calls == [["file_page1.png"]]
+    assert ocr_calls == []
+    assert len(df) == 1
+
+
+def test_serial_path_loads_reader_when_missing(workspace, monkeypatch):
+    images_dir, _ = workspace
+    preprocess(images_dir, [_page(1)])
+    sentinel = object()
+    seen = []
+    monkeypatch.setattr(ocr_extractor, "get_reader", lambda *a, **k: sentinel)
+
+    def fake_rows(reader, doc_type, items, ocr_mode=ocr_extractor.OCR_MODE):
+        seen.append(reader)
+        for fname, _ in items:
+            yield fname, [{"filename": fname, "No_SBG": fname}]
+
+    monkeypatch.setattr(ocr_extractor, "iter_page_rows_pipelined", fake_rows)
+    ocr_extractor.process_doc_type(None, DOC_TYPE, workers=1)
+    assert seen == [sentinel]
+
+
+def test_failed_page_not_journaled_and_retried(workspace, monkeypatch):
+    images_dir, ocr_calls = workspace
+    preprocess(images_dir, [_page(1), _page(2)])
+
+    def flaky_rows(reader, doc_type, items, ocr_mode=ocr_extractor.OCR_MODE):
+        for fname, _ in items:
+            ocr_calls.append(fname)
+            rows = None if fname == "file_page2.png" else [{"filename": fname, "No_SBG": fname}]
+            yield fname, rows
+
+    monkeypatch.setattr(ocr_extractor, "iter_page_rows_pipelined", flaky_rows)
+    df, _ = ocr_extractor.process_doc_type(None, DOC_TYPE)
+    assert list(df["filename"]) == ["file_page1.png"]
+    journal = ocr_extractor.load_journal(ocr_extractor.JOURNAL_TEMPLATE.format(doc_type=DOC_TYPE))
+    assert sorted(journal) == ["file_page1.png"]
+
+    # Resume: hanya halaman yang gagal di-OCR ulang
+    ocr_calls.clear()
+    monkeypatch.setattr(ocr_extractor, "iter_page_rows_pipelined", workspace_rows(ocr_calls))
+    df, _ = ocr_extractor.process_doc_type(None, DOC_TYPE, resume=True)
+    assert ocr_calls == ["file_page2.png"]
+    assert sorted(df["filename"]) == ["file_page1.png", "file_page2.png"]
+
+
+class _BrokenReader:
+    def readtext(self, *args, **kwargs):
+        raise RuntimeError("model error")
+
+    def recognize(self, *args, **kwargs):
+        raise RuntimeError("model error")
+
+
+def test_ocr_errors_mark_page_failed(monkeypatch):
+    monkeypatch.setattr(ocr_extractor, "OCR_CACHE_ENABLED", False)
+    img = _page(1)
+    reader = _BrokenReader()
+    assert ocr_extractor.extract_text_boxes(reader, img, label="p1") is None
+    assert ocr_extractor.ocr_page(reader, DOC_TYPE, "p1", img, ocr_mode="full") is None
+    assert ocr_extractor.parse_page(DOC_TYPE, "p1", None) is None
+    assert ocr_extractor.recognize_cells(reader, img, [(0, "No_SBG", [0, 10, 0, 10])]) is None
+
+
+def test_missing_names_log_per_doc_type(workspace, tmp_path, monkeypatch):
+    images_dir, _ = workspace
+    preprocess(images_dir, [_page(1)])
+    other_dir = tmp_path / "images" / "kredit_bermasalah"
+    other_dir.mkdir()
+    preprocess(str(other_dir), [_page(2)])
+
+    def rows_with_event(reader, doc_type, items, ocr_mode=ocr_extractor.OCR_MODE):
+        for fname, _ in items:
+            ocr_extractor.DIAGNOSTICS.record(doc_type, fname, 1, 0, "Nasabah")
+            yield fname, [{"filename": fname, "No_SBG": fname}]
+
+    monkeypatch.setattr(ocr_extractor, "iter_page_rows_pipelined", rows_with_event)
+    ocr_extractor.process_doc_type(None, DOC_TYPE)
+    ocr_extractor.process_doc_type(None, "kredit_bermasalah")
+
+    # Run doc_type kedua tidak menimpa log doc_type pertama
+    for doc_type in (DOC_TYPE, "kredit_bermasalah"):
+        log = pd.read_csv(ocr_extractor.MISSING_NAMES_TEMPLATE.format(doc_type=doc_type))
+        assert list(log["doc_type"]) == [doc_type]
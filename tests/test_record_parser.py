@@ -0,0 +1,52 @@
+import os
+import sys
+
+import pytest
+
+pytest.importorskip("numpy")
+pytest.importorskip("cv2")
+pytest.importorskip("pandas")
+pytest.importorskip("easyocr")
+pytest.importorskip("pdf2image")
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from utils import ocr_extractor  # noqa: E402
+from utils.record_parser import JT_PARSER  # noqa: E402
+
+SBG = "1234567890123456"
+
+
+@pytest.mark.parametrize("text, nama", [
+    (f"1 {SBG} BUDI SANTOSO 081234567890 01-02-2024 03-03-2024 1.500.000", "BUDI SANTOSO"),
+    (f"{SBG} ANDI, S.Pd 12,500 x", "ANDI, S.Pd"),
+    (f"{SBG}   - RINA*  ;  01-01-2024", "RINA"),
+    (f"{SBG} DEWI 5.000", "DEWI"),
+    # pembatas tidak di-anchor ke token (sama seperti ekstraksi lama)
+    (f"{SBG} SITI 1234.567 AMINAH", "SITI 1"),
+    (f"{SBG} JOKO 1208123456789", "JOKO 12"),
+    (f"{SBG}", ""),
+    ("tanpa no sbg", ""),
+])
+def test_nasabah_cutoff(text, nama):
+    assert JT_PARSER.nasabah(JT_PARSER.tokenize(text), text) == nama
+    assert ocr_extractor.extract_nasabah_jt(text) == nama
+
+
+def test_parse_record():
+    rec = (f"1 {SBG} BUDI SANTOSO 081234567890 01-02-2024 03-03-2024 "
+           "2.000.000 1.500.000 20.000")
+    assert JT_PARSER.parse(rec) == {
+        "No_SBG": SBG,
+        "Nasabah": "BUDI SANTOSO",
+        "Telp_HP": "081234567890",
+        "Tgl_Kredit": "01-02-2024",
+        "Tgl_Jatuh_Tempo": "03-03-2024",
+        "Taksiran": 2000000,
+        "Uang_Pinjaman": 1500000,
+        "SM": 20000,
+    }
+
+
+def test_amounts_stop_at_total():
+    rec = f"{SBG} A 01-02-2024 03-03-2024 300.000 200.000 25.000 TOTAL 901.392.824"
+    assert JT_PARSER.amounts(JT_PARSER.tokenize(rec)) == (300000, 200000, 25000)
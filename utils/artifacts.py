@@ -0,0 +1,247 @@
+import os
+import pandas as pd
+
+# === Artefak antar tahap (raw_ocr → postprocessed → cleaned → parsed_output) ===
+# Mode fused meneruskan DataFrame langsung antar tahap; to_str_frame meniru
+# hasil df.to_csv(...) lalu pd.read_csv(..., dtype=str) supaya tiap tahap
+# melihat data yang sama persis seperti saat transport-nya masih CSV.
+
+# String yang dibaca pd.read_csv sebagai NaN (default na_values pandas)
+CSV_NA_VALUES = {
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None", "n/a",
+    "nan", "null",
+}
+
+
+def to_str_frame(df: pd.DataFrame) -> pd.DataFrame:
+    """DataFrame → kolom object berisi string / NaN (semantik CSV dtype=str)."""
+    out = pd.DataFrame(index=pd.RangeIndex(len(df)))
+    for col in df.columns:
+        values = df[col].reset_index(drop=True)
+        text = values.astype(object).map(lambda v: None if pd.isna(v) else str(v))
+        out[str(col)] = text.where(text.notna() & ~text.isin(CSV_NA_VALUES), float("nan"))
+    return out
+
+
+# === Storage artefak (CSV / Parquet) ===
+# Path artefak di kode tetap ditulis dengan ".csv"; dengan ARTIFACT_FORMAT="parquet"
+# file disimpan sebagai ".parquet" di lokasi yang sama, dan read_artifact/
+# latest_artifact otomatis memilih varian terbaru yang ada.
+ARTIFACT_FORMAT = os.environ.get("OCR_ARTIFACT_FORMAT", "csv")  # "csv" | "parquet"
+ARTIFACT_EXTS = (".csv", ".parquet")
+
+# Skema eksplisit per jenis artefak (nama kolom case-insensitive).
+# "category" → kolom nama di-dictionary-encode di Parquet.
+_ID_TEXT = {"no_sbg": "string", "no_kredit": "string", "telp_hp": "string",
+            "tgl_kredit": "string", "tgl_jatuh_tempo": "string", "tanggal_kredit": "string",
+            "tanggal_jatuh_tempo": "string", "nasabah": "category"}
+SCHEMAS = {
+    "raw_ocr": {**_ID_TEXT, "filename": "category", "no": "Int64", "raw_text": "string",
+                "taksiran": "Int64", "uang_pinjaman": "Int64", "sm": "Int64"},
+    "postprocessed": {**_ID_TEXT, "uang_pinjaman": "Int64"},
+    "cleaned": {**_ID_TEXT, "uang_pinjaman": "Int64"},
+    "parsed": {**_ID_TEXT, "uang_pinjaman": "string"},  # sudah diformat "1.500.000"
+    "dataset": {**_ID_TEXT, "uang_pinjaman": "string"},
+    "preprocessed": {**_ID_TEXT, "uang_pinjaman": "float64", "pinjaman_scaled": "float64"},
+    "clustered": {**_ID_TEXT, "uang_pinjaman": "float64", "pinjaman_scaled": "float64",
+                  "cluster": "int64"},
+}
+
+
+def parquet_available() -> bool:
+    try:
+        import pyarrow  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+_fallback_warned = False
+
+
+def storage_format() -> str:
+    """Format tulis aktif; jatuh ke CSV (dengan peringatan sekali) jika pyarrow tidak terpasang."""
+    global _fallback_warned
+    if ARTIFACT_FORMAT == "parquet":
+        if parquet_available():
+            return "parquet"
+        if not _fallback_warned:
+            print("[WARN] OCR_ARTIFACT_FORMAT=parquet tapi pyarrow tidak terpasang, artefak disimpan sebagai CSV")
+            _fallback_warned = True
+    return "csv"
+
+
+def apply_schema(df: pd.DataFrame, kind: str) -> pd.DataFrame:
+    """Cast kolom sesuai SCHEMAS[kind]; kolom di luar skema dibiarkan."""
+    schema = SCHEMAS.get(kind, {})
+    df = df.copy()
+    for col in df.columns:
+        dtype = schema.get(str(col).lower())
+        if dtype is None:
+            continue
+        if dtype in ("Int64", "int64", "float64"):
+            values = pd.to_numeric(df[col], errors="coerce")
+            if dtype == "int64" and values.isna().any():
+                dtype = "Int64"
+            df[col] = values.astype(dtype)
+        else:
+            text = df[col].astype(object).map(lambda v: None if pd.isna(v) else str(v))
+            df[col] = text.astype("string")
+            if dtype == "category":
+                df[col] = df[col].astype("category")
+    return df
+
+
+def _stem(path: str) -> str:
+    root, ext = os.path.splitext(path)
+    return root if ext in ARTIFACT_EXTS else path
+
+
+def save_artifact(df: pd.DataFrame, path: str, kind=None) -> str:
+    """
+    Simpan artefak pipeline. path boleh berakhiran .csv (nama logis);
+    ekstensi akhir mengikuti storage_format(). Return path yang ditulis.
+    """
+    fmt = storage_format()
+    out_path = _stem(path) + (".parquet" if fmt == "parquet" else ".csv")
+    os.makedirs(os.path.dirname(out_path) or ".", exist_ok=True)
+    if fmt == "parquet":
+        apply_schema(df, kind).to_parquet(out_path, index=False, engine="pyarrow")
+    else:
+        df.to_csv(out_path, index=False, encoding="utf-8-sig")
+    return out_path
+
+
+def resolve_artifact(path: str):
+    """Varian terbaru (csv/parquet) dari path logis; None jika tidak ada."""
+    candidates = [_stem(path) + ext for ext in ARTIFACT_EXTS]
+    existing = [p for p in candidates if os.path.exists(p)]
+    return max(existing, key=os.path.getmtime) if existing else None
+
+
+def read_artifact(path: str, as_str=False) -> pd.DataFrame:
+    """
+    Baca artefak (csv atau parquet, lihat resolve_artifact).
+    as_str=True: semua kolom string/NaN, sama seperti read_csv(dtype=str).
+    Tanpa as_str, Parquet memberi dtype dari skema (angka Int64/float);
+    kolom teks/kategori dikembalikan sebagai object seperti read_csv.
+    """
+    real_path = resolve_artifact(path) or path
+    if real_path.endswith(".parquet"):
+        df = pd.read_parquet(real_path)
+        if as_str:
+            return to_str_frame(df)
+        for col in df.columns:
+            if isinstance(df[col].dtype, (pd.CategoricalDtype, pd.StringDtype)):
+                df[col] = df[col].astype(object).where(df[col].notna(), float("nan"))
+        return df
+    if as_str:
+        return pd.read_csv(real_path, encoding="utf-8-sig", dtype=str)
+    return pd.read_csv(real_path, encoding="utf-8-sig")
+
+
+def list_artifacts(directory: str, prefix: str = ""):
+    """
+    Nama file artefak (csv/parquet) di directory yang diawali prefix, urut nama.
+    Jika satu artefak ada dalam dua format, hanya varian terbaru yang diambil.
+    """
+    if not os.path.isdir(directory):
+        return []
+    newest = {}
+    for f in os.listdir(directory):
+        if not (f.startswith(prefix) and f.endswith(ARTIFACT_EXTS)):
+            continue
+        stem = _stem(f)
+        if stem not in newest or (os.path.getmtime(os.path.join(directory, f))
+                                  > os.path.getmtime(os.path.join(directory, newest[stem]))):
+            newest[stem] = f
+    return sorted(newest.values())
+
+
+def latest_artifact(prefix: str, directory: str):
+    """Artefak terbaru (mtime) berawalan prefix; None jika tidak ada."""
+    files = [os.path.join(directory, f) for f in list_artifacts(directory, prefix)]
+    return max(files, key=os.path.getmtime) if files else None
+
+
+def iter_artifact(path: str, chunk_rows: int, as_str=False):
+    """
+    Baca artefak per potongan chunk_rows baris (generator DataFrame),
+    semantik kolom sama dengan read_artifact.
+    """
+    real_path = resolve_artifact(path) or path
+    if real_path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+        for batch in pq.ParquetFile(real_path).iter_batches(batch_size=chunk_rows):
+            df = batch.to_pandas()
+            if as_str:
+                yield to_str_frame(df)
+                continue
+            for col in df.columns:
+                if isinstance(df[col].dtype, (pd.CategoricalDtype, pd.StringDtype)):
+                    df[col] = df[col].astype(object).where(df[col].notna(), float("nan"))
+            yield df
+        return
+    yield from pd.read_csv(real_path, encoding="utf-8-sig", dtype=str if as_str else None,
+                           chunksize=chunk_rows)
+
+
+class ArtifactWriter:
+    """
+    Tulis artefak per batch (streaming) tanpa menampung seluruh data di memori.
+    Format & skema sama dengan save_artifact; path akhir ada di .path.
+    columns: kolom output; jika sampai close() belum ada batch yang ditulis,
+    file tetap dibuat berisi header saja (Parquet: kosong dengan skema).
+    """
+
+    def __init__(self, path: str, kind=None, columns=None):
+        self.fmt = storage_format()
+        self.kind = kind
+        self.columns = columns
+        self.path = _stem(path) + (".parquet" if self.fmt == "parquet" else ".csv")
+        self.rows = 0
+        self._fh = None
+        self._pq = None
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+    def write(self, df: pd.DataFrame):
+        if self.fmt == "parquet":
+            self._write_parquet(df)
+        else:
+            header = self._fh is None
+            if header:
+                self._fh = open(self.path, "w", encoding="utf-8-sig", newline="")
+            df.to_csv(self._fh, index=False, header=header)
+        self.rows += len(df)
+
+    def _write_parquet(self, df: pd.DataFrame):
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+        df = apply_schema(df, self.kind)
+        if self._pq is None:
+            # indeks dictionary dipatok int32 supaya skema sama di semua batch
+            schema = pa.Schema.from_pandas(df, preserve_index=False)
+            for i, field in enumerate(schema):
+                if pa.types.is_dictionary(field.type):
+                    schema = schema.set(i, field.with_type(pa.dictionary(pa.int32(), pa.string())))
+            self._pq = pq.ParquetWriter(self.path, schema)
+        table = pa.Table.from_pandas(df, schema=self._pq.schema, preserve_index=False)
+        self._pq.write_table(table)
+
+    def close(self, write_empty=True) -> str:
+        if write_empty and self._fh is None and self._pq is None and self.columns is not None:
+            self.write(pd.DataFrame(columns=list(self.columns)))
+        if self._fh is not None:
+            self._fh.close()
+            self._fh = None
+        if self._pq is not None:
+            self._pq.close()
+            self._pq = None
+        return self.path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close(write_empty=exc_type is None)
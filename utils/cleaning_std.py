@@ -2,7 +2,12 @@
 import re
 import pandas as pd
 from datetime import datetime
-import os, glob, unicodedata
+import os, sys, heapq, tempfile, unicodedata
+from operator import itemgetter
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from utils.artifacts import (read_artifact, save_artifact, list_artifacts,
+                             iter_artifact, ArtifactWriter)
 
 # ---- Normalisasi uang ----
 def normalize_rupiah(value: str):
@@ -30,19 +35,37 @@ def normalize_rupiah(value: str):
         return None
 
 
+# Batas panjang digit agar aman di-cast ke Int64 (lebih panjang → dianggap kosong)
+MAX_INT64_DIGITS = 18
+
+def normalize_rupiahs(values: pd.Series) -> pd.Series:
+    """
+    Versi kolom normalize_rupiah (Int64 nullable), aturan sama:
+    artefak OCR ^\d{1,3},\d{3}$ dan nilai < 100.000 dibuang.
+    """
+    valid = values.notna() & values.astype(str).ne("")
+    cleaned = values[valid].astype(str).str.strip().str.replace(r"[^\d.,]", "", regex=True)
+    digits = cleaned.str.replace(r"\D", "", regex=True)
+    digits = digits.where(digits.ne("") & (digits.str.len() <= MAX_INT64_DIGITS))
+    amount = pd.to_numeric(digits, errors="coerce").astype("Int64")
+    amount = amount.mask(cleaned.str.match(r"^\d{1,3},\d{3}$") | (amount < 100000).fillna(False))
+    return amount.reindex(values.index)
+
+
 # ---- Normalisasi tanggal ----
+DATE_FORMATS = [
+    "%d-%m-%Y", "%d/%m/%Y", "%d.%m.%Y",
+    "%d-%m-%y", "%d/%m/%y", "%Y-%m-%d",
+    "%d-%b-%Y", "%d-%b-%y", "%d %B %Y", "%d %b %Y"
+]
+DATE_SAMPLE_SIZE = 200
+
 def normalize_date(value: str) -> str:
     if not value or pd.isna(value):
         return ""
     value = str(value).strip()
 
-    fmts = [
-        "%d-%m-%Y", "%d/%m/%Y", "%d.%m.%Y",
-        "%d-%m-%y", "%d/%m/%y", "%Y-%m-%d",
-        "%d-%b-%Y", "%d-%b-%y", "%d %B %Y", "%d %b %Y"
-    ]
-
-    for fmt in fmts:
+    for fmt in DATE_FORMATS:
         try:
             dt = datetime.strptime(value, fmt)
             return dt.strftime("%d-%m-%Y")
@@ -51,7 +74,61 @@ def normalize_date(value: str) -> str:
     return value
 
 
+def normalize_dates(values: pd.Series) -> pd.Series:
+    """
+    Versi kolom normalize_date (output tetap %d-%m-%Y).
+    Format dominan ditebak dari sampel nilai unik lalu seluruh kolom di-parse
+    sekali dengan pd.to_datetime(format=...); sisa NaT dicoba format lain,
+    dan yang masih gagal jatuh ke normalize_date (nilai asli dipertahankan).
+    """
+    valid = values.notna() & values.astype(str).ne("")
+    text = values[valid].astype(str).str.strip()
+    uniq = pd.Series(pd.unique(text), dtype=object)
+    if uniq.empty:
+        return pd.Series("", index=values.index, dtype=object)
+
+    sample = uniq.head(DATE_SAMPLE_SIZE)
+    dominant = max(
+        DATE_FORMATS,
+        key=lambda fmt: pd.to_datetime(sample, format=fmt, errors="coerce").notna().sum()
+    )
+
+    parsed = pd.to_datetime(uniq, format=dominant, errors="coerce")
+    for fmt in DATE_FORMATS:
+        left = parsed.isna()
+        if not left.any():
+            break
+        if fmt != dominant:
+            parsed[left] = pd.to_datetime(uniq[left], format=fmt, errors="coerce")
+
+    result = parsed.dt.strftime("%d-%m-%Y").astype(object)
+    left = parsed.isna()
+    result[left] = uniq[left].map(normalize_date)
+
+    out = pd.Series("", index=values.index, dtype=object)
+    out[valid] = text.map(dict(zip(uniq, result)))
+    return out
+
+
 # ---- Normalisasi nama (UPPERCASE, hapus gelar) ----
+# Pola di-compile sekali (dipakai normalize_name & normalize_names)
+_QUOTE_RE = re.compile(r"[\"'""'']")
+_TITLE_RE = re.compile(
+    r"\b("
+    r"dr\.?|drs\.?|dr_?|prof\.?|ir\.?|h\.?|kh\.?|tgk\.?|r\.?|hr\.?|se\.?|kt\.?|mm\.?|"
+    r"s\.e\.?|m\.m\.?|s\.farm\.?|m\.farm\.?|s\.ked\.?|s\.kom\.?|m\.kom\.?|"
+    r"s\.si\.?|m\.si\.?|s\.pd\.?|m\.pd\.?|s\.os\.?|m\.os\.?|s\.gz\.?|s\.t\.?|"
+    r"m\.ak\.?|apt\.?|sp\.[a-z]*|spt|spd"
+    r")\b",
+    flags=re.IGNORECASE
+)
+_PUNCT_RE = re.compile(r"[;:,\.\-]+")
+_SPACE_RE = re.compile(r"\s+")
+
+# Memo nama → hasil normalisasi (nasabah yang sama muncul di banyak laporan)
+_NAME_CACHE = {}
+NAME_CACHE_MAX = 200_000
+
 def normalize_name(value: str) -> str:
     if not value or pd.isna(value):
         return ""
@@ -62,30 +139,44 @@ def normalize_name(value: str) -> str:
     text = unicodedata.normalize("NFKC", text)
 
     # hapus semua jenis kutip (", ', ', ", ")
-    text = re.sub(r"[\"'""'']", " ", text)
+    text = _QUOTE_RE.sub(" ", text)
 
     # hapus gelar akademik dan profesional
-    pattern = re.compile(
-        r"\b("
-        r"dr\.?|drs\.?|dr_?|prof\.?|ir\.?|h\.?|kh\.?|tgk\.?|r\.?|hr\.?|se\.?|kt\.?|mm\.?|"
-        r"s\.e\.?|m\.m\.?|s\.farm\.?|m\.farm\.?|s\.ked\.?|s\.kom\.?|m\.kom\.?|"
-        r"s\.si\.?|m\.si\.?|s\.pd\.?|m\.pd\.?|s\.os\.?|m\.os\.?|s\.gz\.?|s\.t\.?|"
-        r"m\.ak\.?|apt\.?|sp\.[a-z]*|spt|spd"
-        r")\b",
-        flags=re.IGNORECASE
-    )
-    text = pattern.sub("", text)
+    text = _TITLE_RE.sub("", text)
 
     # hapus tanda baca aneh ; : , . - yang nempel
-    text = re.sub(r"[;:,\.\-]+", " ", text)
+    text = _PUNCT_RE.sub(" ", text)
 
     # rapikan spasi
-    text = re.sub(r"\s+", " ", text).strip()
+    text = _SPACE_RE.sub(" ", text).strip()
 
     # UPPERCASE (sesuai output postprocessing)
     return text.upper()
 
 
+def normalize_names(values: pd.Series) -> pd.Series:
+    """
+    Versi vektor normalize_name: hanya nama unik yang belum ada di memo
+    yang diproses (lewat accessor .str), lalu dipetakan balik ke kolom.
+    """
+    if len(_NAME_CACHE) > NAME_CACHE_MAX:
+        _NAME_CACHE.clear()
+    todo = [v for v in pd.unique(values.dropna()) if v not in _NAME_CACHE]
+    if todo:
+        text = (
+            pd.Series(todo, dtype=object).astype(str)
+            .str.normalize("NFKC")
+            .str.replace(_QUOTE_RE, " ", regex=True)
+            .str.replace(_TITLE_RE, "", regex=True)
+            .str.replace(_PUNCT_RE, " ", regex=True)
+            .str.replace(_SPACE_RE, " ", regex=True)
+            .str.strip()
+            .str.upper()
+        )
+        _NAME_CACHE.update((v, t if v else "") for v, t in zip(todo, text))
+    return values.map(_NAME_CACHE).fillna("")
+
+
 # ---- Normalisasi nomor (SBG/Kredit) ----
 def normalize_number(value: str) -> str:
     if not value or pd.isna(value):
@@ -93,6 +184,14 @@ def normalize_number(value: str) -> str:
     return re.sub(r"[^\d]", "", str(value))
 
 
+def normalize_numbers(values: pd.Series) -> pd.Series:
+    """Versi kolom normalize_number: hanya digit, kosong → ""."""
+    valid = values.notna() & values.astype(str).ne("")
+    out = pd.Series("", index=values.index, dtype=object)
+    out[valid] = values[valid].astype(str).str.replace(r"\D", "", regex=True)
+    return out
+
+
 # ---- Normalisasi nomor HP ----
 def normalize_hp(value: str) -> str:
     if value is None or pd.isna(value):
@@ -112,8 +211,27 @@ def normalize_hp(value: str) -> str:
     return value  # fallback: simpan apa adanya
 
 
+def normalize_hps(values: pd.Series) -> pd.Series:
+    """Versi kolom normalize_hp: hanya digit, awalan 62 → 0, kosong → ""."""
+    valid = values.notna()
+    out = pd.Series("", index=values.index, dtype=object)
+    digits = values[valid].astype(str).str.replace(r"\D", "", regex=True)
+    out[valid] = digits.str.replace(r"^62", "0", regex=True)
+    return out
+
+
 # ---- Main Cleaner ----
-def clean_dataframe(df: pd.DataFrame, doc_type: str) -> pd.DataFrame:
+# Kolom tanggal untuk sorting per doc_type (kolom pertama yang ada dipakai)
+DATE_COLUMNS = {
+    "jatuh_tempo": ("tgl_jatuh_tempo", "tanggal_jatuh_tempo"),
+    "kredit_bermasalah": ("tgl_kredit", "tanggal_kredit"),
+}
+
+def date_column(columns, doc_type: str):
+    return next((c for c in DATE_COLUMNS.get(doc_type, ()) if c in columns), None)
+
+
+def clean_dataframe(df: pd.DataFrame, doc_type: str, sort=True) -> pd.DataFrame:
     if df.empty:
         return df
 
@@ -124,38 +242,26 @@ def clean_dataframe(df: pd.DataFrame, doc_type: str) -> pd.DataFrame:
 
     # Cleaning untuk nama nasabah
     if "nasabah" in df.columns:
-        df["nasabah"] = df["nasabah"].apply(normalize_name)
+        df["nasabah"] = normalize_names(df["nasabah"])
 
     # Cleaning untuk uang pinjaman
     if "uang_pinjaman" in df.columns:
-        df["uang_pinjaman"] = df["uang_pinjaman"].apply(normalize_rupiah)
+        df["uang_pinjaman"] = normalize_rupiahs(df["uang_pinjaman"])
 
     # Cleaning untuk nomor SBG/Kredit
     if "no_sbg" in df.columns:
-        df["no_sbg"] = df["no_sbg"].apply(normalize_number)
+        df["no_sbg"] = normalize_numbers(df["no_sbg"])
     if "no_kredit" in df.columns:
-        df["no_kredit"] = df["no_kredit"].apply(normalize_number)
+        df["no_kredit"] = normalize_numbers(df["no_kredit"])
 
     # Cleaning untuk tanggal
-    date_col = None
-    if doc_type == "jatuh_tempo":
-        if "tgl_jatuh_tempo" in df.columns:
-            df["tgl_jatuh_tempo"] = df["tgl_jatuh_tempo"].apply(normalize_date)
-            date_col = "tgl_jatuh_tempo"
-        elif "tanggal_jatuh_tempo" in df.columns:
-            df["tanggal_jatuh_tempo"] = df["tanggal_jatuh_tempo"].apply(normalize_date)
-            date_col = "tanggal_jatuh_tempo"
-    elif doc_type == "kredit_bermasalah":
-        if "tgl_kredit" in df.columns:
-            df["tgl_kredit"] = df["tgl_kredit"].apply(normalize_date)
-            date_col = "tgl_kredit"
-        elif "tanggal_kredit" in df.columns:
-            df["tanggal_kredit"] = df["tanggal_kredit"].apply(normalize_date)
-            date_col = "tanggal_kredit"
+    date_col = date_column(df.columns, doc_type)
+    if date_col:
+        df[date_col] = normalize_dates(df[date_col])
 
     # Cleaning untuk nomor HP
     if "telp_hp" in df.columns:
-        df["telp_hp"] = df["telp_hp"].apply(normalize_hp)
+        df["telp_hp"] = normalize_hps(df["telp_hp"])
 
     # Drop rows dengan data penting kosong
     if "nasabah" in df.columns:
@@ -167,15 +273,16 @@ def clean_dataframe(df: pd.DataFrame, doc_type: str) -> pd.DataFrame:
         df = df[df["no_kredit"].notna() & (df["no_kredit"].str.strip() != "")]
 
     # SORTING: Urutkan berdasarkan tanggal (ascending)
-    if date_col and date_col in df.columns:
+    if sort and date_col and date_col in df.columns:
         # Buat kolom sementara untuk sorting (convert ke datetime)
         df["_sort_date"] = pd.to_datetime(
             df[date_col], 
             format="%d-%m-%Y", 
             errors="coerce"
         )
-        # Sort berdasarkan tanggal
-        df = df.sort_values("_sort_date", ascending=True)
+        # Sort berdasarkan tanggal (stabil: urutan asli dipertahankan untuk tanggal sama,
+        # sama dengan clean_file_streaming)
+        df = df.sort_values("_sort_date", ascending=True, kind="stable")
         # Hapus kolom sementara
         df = df.drop(columns=["_sort_date"])
         # Reset index
@@ -184,16 +291,146 @@ def clean_dataframe(df: pd.DataFrame, doc_type: str) -> pd.DataFrame:
     return df
 
 
-def run_cleaning(base_output_dir: str):
+def clean_postprocessed(df: pd.DataFrame, doc_type: str, sort=True) -> pd.DataFrame:
+    """clean_dataframe + pastikan uang_pinjaman integer (Int64), seperti run_cleaning."""
+    df_clean = clean_dataframe(df, doc_type, sort=sort)
+    if "uang_pinjaman" in df_clean.columns:
+        df_clean["uang_pinjaman"] = pd.to_numeric(
+            df_clean["uang_pinjaman"], errors="coerce"
+        ).astype("Int64")
+    return df_clean
+
+
+# ---- Streaming Cleaner (file besar) ----
+# Input dibaca per CLEAN_CHUNK_ROWS baris; tiap chunk dibersihkan, diurutkan
+# (stabil) lalu ditulis sebagai "run" sementara. Run digabung dengan k-way
+# merge (heapq.merge) maksimal MERGE_FAN_IN sekaligus, jadi memori dibatasi
+# oleh ukuran chunk, bukan ukuran file.
+CLEAN_CHUNK_ROWS = 100_000
+CLEAN_STREAM_MIN_BYTES = 64 * 1024 * 1024  # file di atas ini otomatis streaming
+MERGE_FAN_IN = 32
+_SORT_KEY = "_sort_key"
+_NO_DATE_KEY = "99999999"  # tanggal kosong/tidak valid di akhir (seperti NaT)
+
+
+def _sort_keys(dates: pd.Series) -> pd.Series:
+    """Tanggal %d-%m-%Y → kunci teks YYYYMMDD (urut leksikografis = urut tanggal)."""
+    parsed = pd.to_datetime(dates, format="%d-%m-%Y", errors="coerce")
+    return parsed.dt.strftime("%Y%m%d").fillna(_NO_DATE_KEY)
+
+
+def _iter_run(path: str, chunk_rows: int):
+    """Baris (tuple string) dari satu run, dibaca per potongan."""
+    for chunk in pd.read_csv(path, dtype=str, keep_default_na=False, na_filter=False,
+                             chunksize=chunk_rows):
+        yield from chunk.itertuples(index=False, name=None)
+
+
+def _merge_runs(paths, columns, chunk_rows: int, write_batch):
+    """k-way merge run terurut (kunci di kolom pertama); ties ikut urutan run → stabil."""
+    read_rows = max(1, chunk_rows // max(1, len(paths)))
+    merged = heapq.merge(*(_iter_run(p, read_rows) for p in paths), key=itemgetter(0))
+    batch = []
+    for row in merged:
+        batch.append(row)
+        if len(batch) >= chunk_rows:
+            write_batch(pd.DataFrame(batch, columns=columns))
+            batch = []
+    if batch:
+        write_batch(pd.DataFrame(batch, columns=columns))
+
+
+def _merge_to_run(paths, columns, chunk_rows: int, merged_path: str):
+    """Gabung beberapa run menjadi satu run baru (merge bertingkat)."""
+    with open(merged_path, "w", encoding="utf-8", newline="") as fh:
+        first = True
+
+        def write_batch(batch):
+            nonlocal first
+            batch.to_csv(fh, index=False, header=first)
+            first = False
+
+        _merge_runs(paths, columns, chunk_rows, write_batch)
+        if first:
+            # semua run kosong → tetap tulis header supaya run ini bisa dibaca read_csv
+            pd.DataFrame(columns=columns).to_csv(fh, index=False)
+
+
+def clean_file_streaming(in_path: str, out_path: str, doc_type: str,
+                         chunk_rows: int = CLEAN_CHUNK_ROWS):
+    """
+    Versi streaming clean_postprocessed untuk satu file artefak postprocessed:
+    hasil (urut tanggal ascending) ditulis ke out_path lewat ArtifactWriter.
+    Return (path yang ditulis, jumlah record hasil cleaning).
+    """
+    out_dir = os.path.dirname(out_path) or "."
+    os.makedirs(out_dir, exist_ok=True)  # run sementara ditaruh di folder output
+    with tempfile.TemporaryDirectory(prefix="clean_runs_", dir=out_dir) as tmp_dir, \
+            ArtifactWriter(out_path, kind="cleaned") as writer:
+        runs, columns, date_col = [], None, None
+
+        for chunk in iter_artifact(in_path, chunk_rows, as_str=True):
+            df = clean_dataframe(chunk, doc_type, sort=False)
+            if columns is None:
+                columns = list(df.columns)
+                date_col = date_column(columns, doc_type)
+                writer.columns = columns  # semua baris terfilter → tetap tulis header
+            if not date_col:
+                # tanpa kolom tanggal tidak ada sorting → langsung tulis
+                writer.write(_finalize(df))
+                continue
+            if df.empty:
+                continue  # semua baris chunk ini terfilter → tidak perlu run
+            df.insert(0, _SORT_KEY, _sort_keys(df[date_col]))
+            df = df.sort_values(_SORT_KEY, kind="stable")
+            run_path = os.path.join(tmp_dir, f"run_{len(runs):05d}.csv")
+            df.to_csv(run_path, index=False)
+            runs.append(run_path)
+
+        if columns is None:
+            # file kosong: cukup jalur biasa
+            df_clean = clean_postprocessed(read_artifact(in_path, as_str=True), doc_type)
+            return save_artifact(df_clean, out_path, kind="cleaned"), len(df_clean)
+
+        run_columns = [_SORT_KEY] + columns
+        # gabung bertahap jika run lebih banyak dari MERGE_FAN_IN
+        level = 0
+        while len(runs) > MERGE_FAN_IN:
+            next_runs = []
+            for i in range(0, len(runs), MERGE_FAN_IN):
+                group = runs[i:i + MERGE_FAN_IN]
+                merged_path = os.path.join(tmp_dir, f"merge_{level}_{len(next_runs):05d}.csv")
+                _merge_to_run(group, run_columns, chunk_rows, merged_path)
+                for p in group:
+                    os.remove(p)
+                next_runs.append(merged_path)
+            runs, level = next_runs, level + 1
+
+        if runs:
+            _merge_runs(runs, run_columns, chunk_rows,
+                        lambda batch: writer.write(_finalize(batch.drop(columns=[_SORT_KEY]))))
+    return writer.path, writer.rows
+
+
+def _finalize(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast akhir seperti clean_postprocessed (uang_pinjaman → Int64)."""
+    if "uang_pinjaman" in df.columns:
+        df["uang_pinjaman"] = pd.to_numeric(df["uang_pinjaman"], errors="coerce").astype("Int64")
+    return df
+
+
+def run_cleaning(base_output_dir: str, chunk_rows=None):
     """
     Jalankan cleaning untuk semua file postprocessed.
     Output disimpan ke output/cleaned.
+    File di atas CLEAN_STREAM_MIN_BYTES (atau jika chunk_rows diisi) dibersihkan
+    per chunk lewat clean_file_streaming.
     """
     raw_dir = os.path.join(base_output_dir, "postprocessed")
     out_dir = os.path.join(base_output_dir, "cleaned")
     os.makedirs(out_dir, exist_ok=True)
 
-    raw_files = sorted(glob.glob(os.path.join(raw_dir, "*.csv")))
+    raw_files = [os.path.join(raw_dir, f) for f in list_artifacts(raw_dir)]
     if not raw_files:
         print("[WARN] Tidak ada file postprocessed ditemukan.")
         return {}
@@ -207,22 +444,26 @@ def run_cleaning(base_output_dir: str):
         else:
             continue
 
+        out_name = os.path.basename(f).replace("final", "clean")
+        out_path = os.path.join(out_dir, out_name)
+
+        if chunk_rows or os.path.getsize(f) >= CLEAN_STREAM_MIN_BYTES:
+            print(f"[INFO] Processing {os.path.basename(f)} (streaming per chunk)")
+            out_path, total = clean_file_streaming(f, out_path, doc_type,
+                                                   chunk_rows=chunk_rows or CLEAN_CHUNK_ROWS)
+            print(f"[INFO] Hasil cleaning {doc_type} disimpan → {out_path}")
+            print(f"[INFO] Total record setelah cleaning: {total}")
+            results[doc_type] = out_path
+            continue
+
         # Force baca semua sebagai string agar telp_hp tidak hilang
-        df = pd.read_csv(f, encoding="utf-8-sig", dtype=str)
+        df = read_artifact(f, as_str=True)
         
         print(f"[INFO] Processing {os.path.basename(f)} - {len(df)} rows")
         
-        df_clean = clean_dataframe(df, doc_type)
+        df_clean = clean_postprocessed(df, doc_type)
 
-        # Pastikan uang_pinjaman integer
-        if "uang_pinjaman" in df_clean.columns:
-            df_clean["uang_pinjaman"] = pd.to_numeric(
-                df_clean["uang_pinjaman"], errors="coerce"
-            ).astype("Int64")
-
-        out_name = os.path.basename(f).replace("final", "clean")
-        out_path = os.path.join(out_dir, out_name)
-        df_clean.to_csv(out_path, index=False, encoding="utf-8-sig")
+        out_path = save_artifact(df_clean, out_path, kind="cleaned")
         
         print(f"[INFO] Hasil cleaning {doc_type} disimpan → {out_path}")
         print(f"[INFO] Total record setelah cleaning: {len(df_clean)}")
@@ -235,39 +476,4 @@ def run_cleaning(base_output_dir: str):
 
 # ---- Runner ----
 if __name__ == "__main__":
-    RAW_DIR = os.path.join("output", "postprocessed")
-    OUT_DIR = os.path.join("output", "cleaned")
-    os.makedirs(OUT_DIR, exist_ok=True)
-
-    raw_files = sorted(glob.glob(os.path.join(RAW_DIR, "*.csv")))
-    if not raw_files:
-        print("[WARN] Tidak ada file postprocessed ditemukan.")
-    else:
-        for f in raw_files:
-            if "jatuh_tempo" in os.path.basename(f):
-                doc_type = "jatuh_tempo"
-            elif "kredit_bermasalah" in os.path.basename(f):
-                doc_type = "kredit_bermasalah"
-            else:
-                continue
-
-            # Force baca semua sebagai string agar telp_hp tidak hilang
-            df = pd.read_csv(f, encoding="utf-8-sig", dtype=str)
-            
-            print(f"[INFO] Processing {os.path.basename(f)} - {len(df)} rows")
-            
-            df_clean = clean_dataframe(df, doc_type)
-
-            # Pastikan uang_pinjaman integer, bukan float
-            if "uang_pinjaman" in df_clean.columns:
-                df_clean["uang_pinjaman"] = pd.to_numeric(
-                    df_clean["uang_pinjaman"], errors="coerce"
-                ).astype("Int64")
-
-            out_name = os.path.basename(f).replace("final", "clean")
-            out_path = os.path.join(OUT_DIR, out_name)
-            df_clean.to_csv(out_path, index=False, encoding="utf-8-sig")
-            
-            print(f"[INFO] Hasil cleaning {doc_type} disimpan → {out_path}")
-            print(f"[INFO] Total record setelah cleaning: {len(df_clean)}")
-            print(f"[INFO] Data telah diurutkan berdasarkan tanggal (ascending)")
\ No newline at end of file
+    run_cleaning("output")
@@ -0,0 +1,74 @@
+import os
+import json
+import threading
+
+# === Config aplikasi (config/*.json) ===
+# Path absolut dari root project, jadi tidak tergantung cwd. File di-parse sekali
+# lalu di-cache; tiap akses hanya os.stat, dan file dibaca ulang otomatis saat
+# mtime/ukurannya berubah (mis. template disimpan dari halaman Template Message).
+
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # root project
+CONFIG_DIR = os.path.join(BASE_DIR, "config")
+TEMPLATES_PATH = os.path.join(CONFIG_DIR, "templates.json")
+STRUCT_FIELDS_PATH = os.path.join(CONFIG_DIR, "struktur_fields.json")
+
+
+class CachedJSON:
+    """File JSON ter-cache dengan hot reload berbasis (mtime, size)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._signature = None
+        self._data = None
+        self._lock = threading.Lock()
+
+    def _stat(self):
+        try:
+            st = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def get(self):
+        """
+        Isi file (dict). File tidak ada → {}. Jika file sedang ditulis (JSON
+        belum valid), isi lama tetap dipakai dan dicoba lagi di akses berikutnya.
+        Jangan ubah dict hasilnya; dict yang sama dipakai bersama.
+        """
+        signature = self._stat()
+        with self._lock:
+            if self._data is not None and signature == self._signature:
+                return self._data
+            if signature is None:
+                data = {}
+            else:
+                try:
+                    with open(self.path, "r", encoding="utf-8") as f:
+                        data = json.load(f)
+                except json.JSONDecodeError:
+                    if self._data is None:
+                        raise
+                    print(f"[WARN] {self.path} tidak valid, pakai versi sebelumnya")
+                    return self._data
+            self._data, self._signature = data, signature
+            return data
+
+    def invalidate(self):
+        with self._lock:
+            self._data, self._signature = None, None
+
+
+TEMPLATES = CachedJSON(TEMPLATES_PATH)
+STRUCT_FIELDS = CachedJSON(STRUCT_FIELDS_PATH)
+
+
+def load_templates():
+    return TEMPLATES.get()
+
+
+def load_struct_fields():
+    return STRUCT_FIELDS.get()
+
+
+def get_template(doc_type: str) -> str:
+    return load_templates().get(doc_type, "")
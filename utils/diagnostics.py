@@ -0,0 +1,61 @@
+import os
+import json
+import threading
+import pandas as pd
+
+# === Diagnostics tahap OCR ===
+# Event field yang hilang (mis. nama nasabah tidak terbaca) dikumpulkan di memori
+# lalu ditulis sekali per run sebagai CSV ber-quote (atau Parquet).
+
+COLUMNS = ["doc_type", "filename", "page", "record_index", "field",
+           "no_sbg", "bbox", "confidence", "raw_text"]
+
+
+class DiagnosticsSink:
+    """Buffer event diagnostics (thread-safe); flush() menulis semuanya sekaligus."""
+
+    def __init__(self):
+        self._events = []
+        self._lock = threading.Lock()
+
+    def record(self, doc_type, filename, page, record_index, field,
+               no_sbg="", bbox=None, confidence=None, raw_text=""):
+        event = {
+            "doc_type": doc_type,
+            "filename": filename,
+            "page": page,
+            "record_index": record_index,
+            "field": field,
+            "no_sbg": no_sbg,
+            "bbox": json.dumps(bbox) if bbox is not None else "",
+            "confidence": confidence,
+            "raw_text": raw_text,
+        }
+        with self._lock:
+            self._events.append(event)
+
+    def extend(self, events):
+        """Gabungkan event dari proses lain (worker OCR)."""
+        with self._lock:
+            self._events.extend(events)
+
+    def drain(self):
+        """Ambil lalu kosongkan buffer."""
+        with self._lock:
+            events, self._events = self._events, []
+        return events
+
+    def flush(self, path: str):
+        """
+        Tulis semua event ke path (.csv atau .parquet) lalu kosongkan buffer.
+        File selalu ditimpa, tanpa event pun (hanya header), supaya log run
+        sebelumnya tidak terlihat seperti hasil run ini. Return jumlah event.
+        """
+        events = self.drain()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        df = pd.DataFrame(events, columns=COLUMNS)
+        if path.endswith(".parquet"):
+            df.to_parquet(path, index=False)
+        else:
+            df.to_csv(path, index=False, encoding="utf-8-sig")
+        return len(events)
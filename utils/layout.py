@@ -0,0 +1,80 @@
+import re
+import numpy as np
+
+# === Layout hasil OCR box-level ===
+# Hasil readtext (bbox, teks, prob) diubah ke array (N, 4, 2) lalu dikelompokkan
+# per baris dengan operasi NumPy (sort sekali + np.diff), tanpa loop per box.
+
+
+def boxes_to_array(ocr_results) -> np.ndarray:
+    """list (bbox, teks, prob) → array float (N, 4, 2) berisi titik bbox."""
+    if not ocr_results:
+        return np.zeros((0, 4, 2), dtype=np.float32)
+    return np.asarray([r[0] for r in ocr_results], dtype=np.float32).reshape(-1, 4, 2)
+
+
+def group_lines(ocr_results, y_tol=25):
+    """
+    Kelompokkan box OCR per baris berdasarkan y-top.
+    Box baru masuk baris baru jika selisih y-top dengan box sebelumnya
+    (urut y lalu x) >= y_tol. Dalam satu baris box diurutkan menurut x-left.
+
+    Return list baris (urut atas → bawah), tiap baris dict:
+      "y_top": y-top box pertama baris,
+      "index": index box asal (urut x),
+      "x_left": x-left tiap box,
+      "texts": teks tiap box,
+      "probs": confidence tiap box,
+      "text": teks baris (digabung spasi, whitespace dirapikan).
+    """
+    if not ocr_results:
+        return []
+
+    boxes = boxes_to_array(ocr_results)
+    y_top = boxes[:, :, 1].min(axis=1)
+    x_left = boxes[:, :, 0].min(axis=1)
+
+    order = np.lexsort((x_left, y_top))
+    breaks = np.diff(y_top[order]) >= y_tol
+    line_id = np.concatenate(([0], np.cumsum(breaks)))
+    # Urutkan ulang per (baris, x) — lexsort stabil, jadi urutan y tetap untuk x yang sama
+    order = order[np.lexsort((x_left[order], line_id))]
+    starts = np.flatnonzero(np.r_[True, np.diff(line_id) > 0])
+    ends = np.r_[starts[1:], len(order)]
+
+    lines = []
+    for start, end in zip(starts, ends):
+        idx = order[start:end]
+        texts = [str(ocr_results[i][1]) for i in idx]
+        lines.append({
+            "y_top": float(y_top[idx].min()),
+            "index": idx.tolist(),
+            "x_left": x_left[idx].tolist(),
+            "texts": texts,
+            "probs": [float(ocr_results[i][2]) for i in idx],
+            "text": re.sub(r"\s+", " ", " ".join(texts)).strip(),
+        })
+    return lines
+
+
+def line_texts(ocr_results, y_tol=25):
+    """Teks per baris (baris kosong dibuang)."""
+    return [ln["text"] for ln in group_lines(ocr_results, y_tol) if ln["text"]]
+
+
+def assign_columns(lines, column_edges):
+    """
+    Petakan box tiap baris ke kolom berdasarkan x-left.
+    column_edges: batas kiri kolom (urut naik), mis. [0, 120, 400].
+    Return list dict {index_kolom: teks} per baris; box dalam kolom yang sama digabung.
+    """
+    edges = np.asarray(column_edges, dtype=np.float32)
+    table = []
+    for ln in lines:
+        cols = np.searchsorted(edges, np.asarray(ln["x_left"], dtype=np.float32), side="right") - 1
+        row = {}
+        for col, text in zip(cols.tolist(), ln["texts"]):
+            col = max(col, 0)
+            row[col] = f"{row[col]} {text}".strip() if col in row else text
+        table.append(row)
+    return table
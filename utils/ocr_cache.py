@@ -0,0 +1,89 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import numpy as np
+
+# === Cache hasil OCR mentah ===
+# Hasil readtext (box, teks, confidence) disimpan per hash isi gambar + konfigurasi
+# reader, sehingga perubahan logika parsing/regex bisa di-replay tanpa OCR ulang.
+# Disimpan di cache/ (root project), di luar output/ yang dibersihkan cleanup otomatis.
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))  # root project
+CACHE_PATH = os.path.join(BASE_DIR, "cache", "ocr_cache.sqlite")
+
+_conn = None
+_conn_pid = None
+_lock = threading.Lock()
+
+
+def _connect():
+    """
+    Koneksi SQLite per proses (worker OCR membuka koneksinya sendiri).
+    Jika file database hilang (dihapus dari luar), koneksi lama ditutup lalu
+    dibuka ulang supaya tulisan berikutnya tidak masuk ke file yang sudah di-unlink.
+    """
+    global _conn, _conn_pid
+    if _conn is not None and _conn_pid == os.getpid() and not os.path.exists(CACHE_PATH):
+        try:
+            _conn.close()
+        except sqlite3.Error:
+            pass
+        _conn = None
+    if _conn is None or _conn_pid != os.getpid():
+        os.makedirs(os.path.dirname(CACHE_PATH), exist_ok=True)
+        _conn = sqlite3.connect(CACHE_PATH, timeout=30, check_same_thread=False)
+        _conn.execute("PRAGMA journal_mode=WAL")
+        _conn.execute(
+            "CREATE TABLE IF NOT EXISTS ocr_cache ("
+            "key TEXT PRIMARY KEY, result TEXT NOT NULL, created REAL NOT NULL)"
+        )
+        _conn.commit()
+        _conn_pid = os.getpid()
+    return _conn
+
+
+def image_key(img: np.ndarray, tag: str) -> str:
+    """Key cache: hash piksel gambar + shape + tag konfigurasi reader/mode."""
+    h = hashlib.sha256()
+    h.update(tag.encode("utf-8"))
+    h.update(str(img.shape).encode("utf-8"))
+    h.update(np.ascontiguousarray(img).tobytes())
+    return h.hexdigest()
+
+
+def to_builtin(obj):
+    """Ubah hasil EasyOCR (tuple, numpy int/float) jadi tipe JSON biasa."""
+    if isinstance(obj, (list, tuple)):
+        return [to_builtin(o) for o in obj]
+    if isinstance(obj, np.ndarray):
+        return to_builtin(obj.tolist())
+    if isinstance(obj, np.generic):
+        return obj.item()
+    return obj
+
+
+def get(key: str):
+    """Ambil hasil OCR ter-cache (None jika belum ada)."""
+    with _lock:
+        row = _connect().execute("SELECT result FROM ocr_cache WHERE key = ?", (key,)).fetchone()
+    return json.loads(row[0]) if row else None
+
+
+def put(key: str, result) -> None:
+    payload = json.dumps(to_builtin(result), ensure_ascii=False)
+    with _lock:
+        conn = _connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO ocr_cache (key, result, created) VALUES (?, ?, ?)",
+            (key, payload, time.time()),
+        )
+        conn.commit()
+
+
+def clear() -> None:
+    with _lock:
+        conn = _connect()
+        conn.execute("DELETE FROM ocr_cache")
+        conn.commit()
@@ -1,47 +1,276 @@
 import os
 import re
+import time
 import datetime as dt
+import atexit
+import queue
+import threading
+import multiprocessing as mp
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 import pandas as pd
+import sys
+import json
+import hashlib
 import easyocr
+from easyocr.utils import get_paragraph
 from tqdm import tqdm
 import cv2
+from PIL import Image
+
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from utils import preprocessing_ocr
+from utils import ocr_cache
+from utils import layout
+from utils import artifacts
+from utils.record_parser import JT_PARSER
+from utils.diagnostics import DiagnosticsSink
 
 # === Folder input & output ===
 IMAGES_DIR = "images"
 OUTPUT_DIR = os.path.join("output", "raw_ocr")
 os.makedirs(OUTPUT_DIR, exist_ok=True)
 
-MISSING_NAMES_LOG = os.path.join("output", "missing_names.csv")
+# Event field hilang (nama UNKNOWN_NASABAH, dst.) di-buffer lalu ditulis sekali per run,
+# satu file per doc_type supaya run doc_type lain tidak menimpanya
+MISSING_NAMES_TEMPLATE = os.path.join("output", "missing_names_{doc_type}.csv")
+DIAGNOSTICS = DiagnosticsSink()
+
+# Jumlah proses OCR (1 = serial di proses utama)
+OCR_WORKERS = 1
+
+# Mode OCR jatuh_tempo:
+# "full" → deteksi teks (CRAFT) satu halaman penuh lalu split regex per No_SBG
+# "grid" → potong sel dari garis tabel, recognition saja per sel (tanpa detektor)
+# "batched" → halaman berukuran sama di-OCR bersama via readtext_batched (semua doc_type)
+# "adaptive" → pass cepat di resolusi rendah, box ber-confidence rendah di-recognize ulang
+#              dari resolusi penuh (upscale 2x + adaptive threshold) (semua doc_type)
+OCR_MODE = "full"
+# Halaman per panggilan readtext_batched (mode "batched"). Yang di-batch hanya deteksi
+# CRAFT; di CPU recognition EasyOCR tetap jalan per box apa pun batch_size-nya, jadi
+# di server tanpa GPU keuntungan mode ini kecil. Mode "grid" tidak punya knob batch:
+# untungnya datang dari melewati detektor, bukan dari batching recognize().
+OCR_BATCH_SIZE = 4
+
+OCR_LANGS = ("id", "en")
+
+# Jalur serial: OCR (producer, thread sendiri) → antrian terbatas → ekstraksi record
+# (consumer, thread pool) supaya parsing halaman N jalan bersamaan dengan OCR halaman N+1
+PARSE_WORKERS = 1
+PARSE_QUEUE_SIZE = 8
+
+# Mode adaptive: skala pass pertama, batas confidence untuk re-OCR, padding crop (px)
+ADAPTIVE_SCALE = 0.5
+ADAPTIVE_CONF_THRESHOLD = 0.6
+ADAPTIVE_PAD = 4
+
+# Cache hasil readtext per hash gambar (lihat utils/ocr_cache.py)
+OCR_CACHE_ENABLED = True
+
+# Journal per halaman (JSONL) → run yang crash bisa dilanjutkan dengan resume=True
+JOURNAL_TEMPLATE = os.path.join(OUTPUT_DIR, "{doc_type}_journal.jsonl")
 
 # === Init EasyOCR ===
-def get_reader():
-    use_gpu = False
+# Reader di-cache per proses (key: bahasa + device) supaya bobot model hanya
+# di-load sekali; modul ini tetap ter-import selama proses Streamlit hidup,
+# jadi doc_type berikutnya & rerun halaman memakai Reader yang sama.
+_READER_CACHE = {}
+_READER_LOCK = threading.Lock()
+
+def _detect_device() -> str:
     try:
         import torch
-        use_gpu = torch.cuda.is_available()
-        if use_gpu:
-            print(f"[INFO] GPU terdeteksi: {torch.cuda.get_device_name(0)}")
+        if torch.cuda.is_available():
+            return "cuda"
     except Exception:
         pass
-    return easyocr.Reader(['id', 'en'], gpu=use_gpu)
+    return "cpu"
+
+def get_reader(langs=OCR_LANGS, gpu=None):
+    """Ambil Reader EasyOCR dari cache proses; dibuat hanya saat pertama kali diminta."""
+    device = _detect_device() if gpu is None else ("cuda" if gpu else "cpu")
+    key = (tuple(langs), device)
+    with _READER_LOCK:
+        reader = _READER_CACHE.get(key)
+        if reader is None:
+            if device == "cuda":
+                import torch
+                print(f"[INFO] GPU terdeteksi: {torch.cuda.get_device_name(0)}")
+            print(f"[INFO] Load model EasyOCR {list(langs)} ({device})...")
+            reader = easyocr.Reader(list(langs), gpu=(device == "cuda"))
+            _READER_CACHE[key] = reader
+    return reader
 
 # === OCR helpers ===
-def extract_text(reader, img_path: str) -> str:
-    """Paragraph=True untuk flow lama (kredit_bermasalah)"""
+def reader_tag(reader, op: str) -> str:
+    """Identitas konfigurasi reader + operasi, bagian dari key cache OCR."""
+    return json.dumps({
+        "op": op,
+        "easyocr": getattr(easyocr, "__version__", ""),
+        "langs": list(getattr(reader, "lang_list", [])),
+        "recog": getattr(reader, "model_lang", ""),
+        "network": getattr(reader, "recog_network", ""),
+    }, sort_keys=True)
+
+def readtext_boxes(reader, img):
+    """
+    reader.readtext(paragraph=False) dengan cache per hash gambar + konfigurasi reader.
+    Return list [bbox, teks, confidence] (tipe JSON biasa).
+    """
+    gray = load_gray(img)
+    if gray is None:
+        raise ValueError("gambar tidak bisa dibaca")
+
+    key = ocr_cache.image_key(gray, reader_tag(reader, "readtext")) if OCR_CACHE_ENABLED else None
+    if key:
+        cached = ocr_cache.get(key)
+        if cached is not None:
+            return cached
+
+    results = ocr_cache.to_builtin(reader.readtext(gray, detail=1, paragraph=False))
+    if key:
+        ocr_cache.put(key, results)
+    return results
+
+def paragraph_text(boxes) -> str:
+    """Gabung hasil box-level jadi teks paragraph (sama dengan readtext paragraph=True)."""
+    results = get_paragraph(boxes, x_ths=1.0, y_ths=0.5, mode="ltr") if boxes else []
+    return " ".join([r[1] for r in results]) if results else ""
+
+def page_label(img, label=None) -> str:
+    """Nama halaman untuk log; array gambar in-memory tidak ikut dicetak."""
+    if label:
+        return label
+    return img if isinstance(img, str) else f"<gambar {getattr(img, 'shape', '?')}>"
+
+def extract_text_boxes(reader, img_path, label=None):
+    """Paragraph=False untuk ambil box-by-box (jatuh_tempo). Return None jika OCR gagal."""
     try:
-        results = reader.readtext(img_path, detail=1, paragraph=True)
-        return " ".join([r[1] for r in results]) if results else ""
+        return readtext_boxes(reader, img_path)
     except Exception as e:
-        print(f"[ERROR] OCR gagal untuk {img_path}: {e}")
-        return ""
+        print(f"[ERROR] OCR (boxes) gagal untuk {page_label(img_path, label)}: {e}")
+        return None
 
-def extract_text_boxes(reader, img_path: str):
-    """Paragraph=False untuk ambil box-by-box (jatuh_tempo)"""
+def extract_text_boxes_adaptive(reader, img_path, scale=ADAPTIVE_SCALE,
+                                conf_threshold=ADAPTIVE_CONF_THRESHOLD, label=None):
+    """
+    Box-level OCR dua tahap: readtext di resolusi `scale`, lalu box dengan
+    confidence < conf_threshold di-recognize ulang dari crop resolusi penuh
+    (upscale 2x + adaptive threshold). Koordinat box dalam resolusi penuh.
+    Return None jika OCR gagal.
+    """
     try:
-        return reader.readtext(img_path, detail=1, paragraph=False)
+        gray = load_gray(img_path)
+        if gray is None:
+            raise ValueError("gambar tidak bisa dibaca")
+
+        key = None
+        if OCR_CACHE_ENABLED:
+            key = ocr_cache.image_key(gray, reader_tag(reader, f"adaptive:{scale}:{conf_threshold}"))
+            cached = ocr_cache.get(key)
+            if cached is not None:
+                return cached
+
+        small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        h, w = gray.shape[:2]
+        results = []
+        for bbox, text, conf in readtext_boxes(reader, small):
+            bbox = [[int(round(x / scale)), int(round(y / scale))] for x, y in bbox]
+            if conf < conf_threshold:
+                xs, ys = [p[0] for p in bbox], [p[1] for p in bbox]
+                x1, x2 = max(min(xs) - ADAPTIVE_PAD, 0), min(max(xs) + ADAPTIVE_PAD, w)
+                y1, y2 = max(min(ys) - ADAPTIVE_PAD, 0), min(max(ys) + ADAPTIVE_PAD, h)
+                if x2 > x1 and y2 > y1:
+                    crop = preprocessing_ocr.upscale_adaptive_threshold(gray[y1:y2, x1:x2])
+                    ch, cw = crop.shape[:2]
+                    redo = reader.recognize(crop, horizontal_list=[[0, cw, 0, ch]], free_list=[],
+                                            detail=1, paragraph=False)
+                    if redo and redo[0][2] > conf:
+                        text, conf = redo[0][1], redo[0][2]
+            results.append([bbox, text, float(conf)])
+
+        if key:
+            ocr_cache.put(key, results)
+        return results
     except Exception as e:
-        print(f"[ERROR] OCR (boxes) gagal untuk {img_path}: {e}")
-        return []
+        print(f"[ERROR] OCR (adaptive) gagal untuk {page_label(img_path, label)}: {e}")
+        return None
+
+def extract_boxes_batched(reader, imgs, batch_size=OCR_BATCH_SIZE):
+    """
+    Versi batch dari extract_text_boxes untuk beberapa halaman berukuran sama.
+    Halaman yang sudah ada di cache OCR tidak ikut di-batch.
+    Return list box [bbox, teks, confidence] per halaman, urut sesuai imgs
+    (None untuk halaman yang batch-nya gagal).
+    """
+    tag = reader_tag(reader, "readtext")
+    keys = [ocr_cache.image_key(img, tag) if OCR_CACHE_ENABLED else None for img in imgs]
+    boxes = [ocr_cache.get(key) if key else None for key in keys]
+    missing = [i for i, b in enumerate(boxes) if b is None]
+
+    if missing:
+        h, w = imgs[missing[0]].shape[:2]
+        try:
+            results = reader.readtext_batched([imgs[i] for i in missing], n_width=w, n_height=h,
+                                              batch_size=batch_size, detail=1, paragraph=False)
+        except Exception as e:
+            print(f"[ERROR] OCR batch gagal ({len(missing)} halaman): {e}")
+            results = None
+        for pos, i in enumerate(missing):
+            if results is None:
+                continue
+            boxes[i] = ocr_cache.to_builtin(results[pos])
+            if keys[i]:
+                ocr_cache.put(keys[i], boxes[i])
+
+    return boxes
+
+def image_shape(img):
+    """(tinggi, lebar) gambar; untuk path cukup baca header file."""
+    if isinstance(img, str):
+        with Image.open(img) as im:
+            return im.size[1], im.size[0]
+    return img.shape[:2]
+
+def load_gray(img):
+    """Path atau array → array grayscale."""
+    if isinstance(img, str):
+        return cv2.imread(img, cv2.IMREAD_GRAYSCALE)
+    return img if img.ndim == 2 else cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+
+def recognize_cells(reader, gray, cells):
+    """
+    Recognition saja (tanpa detektor CRAFT) untuk sel dari get_table_cells.
+    Return dict (index_baris, nama_kolom) → teks, atau None jika OCR gagal.
+    """
+    if not cells:
+        return {}
+    origin = {(box[0], box[2]): (row_idx, col) for row_idx, col, box in cells}
+    horizontal_list = [box for _, _, box in cells]
+
+    cache_key = None
+    if OCR_CACHE_ENABLED:
+        cache_key = ocr_cache.image_key(gray, reader_tag(reader, f"recognize:{json.dumps(horizontal_list)}"))
+    results = ocr_cache.get(cache_key) if cache_key else None
+    if results is None:
+        try:
+            results = ocr_cache.to_builtin(reader.recognize(
+                gray, horizontal_list=horizontal_list, free_list=[],
+                detail=1, paragraph=False
+            ))
+        except Exception as e:
+            print(f"[ERROR] OCR (grid) gagal: {e}")
+            return None
+        if cache_key:
+            ocr_cache.put(cache_key, results)
+
+    texts = {}
+    for bbox, text, _prob in results:
+        # EasyOCR mengembalikan box [[x_min, y_min], ...] → petakan balik ke sel
+        cell = origin.get((int(bbox[0][0]), int(bbox[0][1])))
+        if cell:
+            texts[cell] = clean_whitespace(text)
+    return texts
 
 def clean_whitespace(text: str) -> str:
     return re.sub(r"\s+", " ", text).strip()
@@ -74,43 +303,13 @@ def _group_lines_by_y(ocr_results, y_tol=25):
     """
     Group hasil OCR per-baris tabel berdasarkan posisi Y.
     ocr_results: list of (bbox, text, prob)
+    Implementasi vektor ada di utils/layout.py (group_lines untuk struktur baris/kolom).
     """
-    if not ocr_results:
-        return []
-
-    items = []
-    for bbox, text, prob in ocr_results:
-        # bbox is list of 4 points: [[x1,y1],[x2,y2],[x3,y3],[x4,y4]]
-        ys = [p[1] for p in bbox]
-        y_top = min(ys)
-        xs = [p[0] for p in bbox]
-        x_left = min(xs)
-        items.append((y_top, x_left, text))
-
-    items.sort(key=lambda t: (t[0], t[1]))
-
-    lines = []
-    current = []
-    last_y = None
-    for y, x, text in items:
-        if last_y is None or abs(y - last_y) < y_tol:
-            current.append((x, text))
-            last_y = y
-        else:
-            current.sort(key=lambda t: t[0])
-            line_text = " ".join(t for _, t in current)
-            lines.append(clean_whitespace(line_text))
-            current = [(x, text)]
-            last_y = y
-
-    if current:
-        current.sort(key=lambda t: t[0])
-        line_text = " ".join(t for _, t in current)
-        lines.append(clean_whitespace(line_text))
-
-    return [ln for ln in lines if ln]
+    return layout.line_texts(ocr_results, y_tol)
 
 # === NEW: Extraction functions for jatuh_tempo ONLY ===
+# Implementasi ada di utils/record_parser.py (tokenize sekali per record);
+# fungsi di bawah dipertahankan untuk pemanggil per-field (mis. mode grid).
 def extract_nasabah_jt(raw_text: str) -> str:
     """
     Ekstrak nama nasabah untuk jatuh_tempo:
@@ -119,44 +318,7 @@ def extract_nasabah_jt(raw_text: str) -> str:
     """
     if not raw_text or not isinstance(raw_text, str):
         return ""
-
-    parse_text = raw_text
-    parse_text = re.sub(r"\s+", " ", parse_text).strip()
-    parse_text = re.sub(r"(?<=[A-Za-z])(?=\d)", " ", parse_text)
-    parse_text = re.sub(r"(?<=\d)(?=[A-Za-z])", " ", parse_text)
-    parse_text = re.sub(r"[^0-9A-Za-z\s\.,\-:\/]", " ", parse_text)
-    parse_text = re.sub(r"\s+", " ", parse_text).strip()
-
-    # Cari No_SBG
-    m = re.search(r"\b(\d{15,16})\b", parse_text)
-    if not m:
-        return ""
-
-    start = m.end()
-    tail = parse_text[start:].strip()
-    if not tail:
-        return ""
-
-    # Cari pembatas: nomor telepon, tanggal, atau angka dengan koma
-    # Priority: telepon > tanggal > angka koma
-    telp_match = re.search(r"(08\d{8,11})", tail)
-    date_match = re.search(r"\b\d{2}-\d{2}-\d{4}\b", tail)
-    num_match = re.search(r"\d{1,3}[.,]\d{3}", tail)
-    
-    # Ambil pembatas pertama yang ditemukan
-    cutoff = len(tail)
-    if telp_match:
-        cutoff = min(cutoff, telp_match.start())
-    if date_match:
-        cutoff = min(cutoff, date_match.start())
-    if num_match:
-        cutoff = min(cutoff, num_match.start())
-    
-    nama_raw = tail[:cutoff].strip()
-    
-    # Bersihkan tanda baca di awal/akhir
-    nama_raw = re.sub(r"^[\W_]+|[\W_]+$", "", nama_raw)
-    return nama_raw.strip()
+    return JT_PARSER.nasabah(JT_PARSER.tokenize(raw_text), raw_text)
 
 def extract_telp_jt(raw_text: str) -> str:
     """
@@ -165,11 +327,7 @@ def extract_telp_jt(raw_text: str) -> str:
     """
     if not raw_text:
         return ""
-    
-    # Hilangkan word boundary agar bisa deteksi nomor yang nempel
-    telps = re.findall(r"08\d{8,11}", raw_text)
-    telps = [t for t in telps if 10 <= len(t) <= 13]
-    return "; ".join(sorted(set(telps)))
+    return JT_PARSER.phones(JT_PARSER.tokenize(raw_text))
 
 def extract_tanggal_jt(raw_text: str) -> tuple:
     """
@@ -178,68 +336,14 @@ def extract_tanggal_jt(raw_text: str) -> tuple:
     """
     if not raw_text:
         return ("", "")
-    
-    tgls = re.findall(r"\b\d{2}-\d{2}-\d{4}\b", raw_text)
-    tgl_kredit = tgls[0] if len(tgls) > 0 else ""
-    tgl_jt = tgls[1] if len(tgls) > 1 else ""
-    return (tgl_kredit, tgl_jt)
+    return JT_PARSER.dates(JT_PARSER.tokenize(raw_text))
 
 def extract_financial_triple_jt(parse_text: str) -> tuple:
     """
     Ekstrak tiga angka terakhir: (taksiran, uang_pinjaman, sm).
-    Filter:
-    - Buang No_SBG (16 digit)
-    - Buang nomor telepon (range 8-9 billion, covers 08xxxxxxxxx patterns)
-    - Buang tahun (4 digit: 2024, 2025, dll)
-    - Buang angka TOTAL yang spesifik (901392824, 781774200, 66871800)
-    - Ambil angka financial valid
-    """
-    # CRITICAL: Buang baris TOTAL jika OCR ikut baca
-    parse_text = re.sub(r'TOTAL.*', '', parse_text, flags=re.IGNORECASE)
-    
-    # Known TOTAL values yang harus dibuang (dari page 9)
-    TOTAL_VALUES = {901392824, 781774200, 66871800}
-    
-    # Temukan semua angka dengan format ribuan atau plain digit
-    all_nums = re.findall(r"\d{1,3}(?:[.,]\d{3})+|\d{3,}", parse_text)
-    
-    # Filter dan bersihkan
-    cleaned_nums = []
-    for n in all_nums:
-        val = normalize_number(n)
-        original_len = len(n.replace(",", "").replace(".", ""))
-        
-        # Filter rules:
-        # 1. Buang No_SBG (16 digit)
-        if original_len == 16:
-            continue
-        
-        # 2. Buang tahun (exactly 4 digit: 2024, 2025, etc)
-        if original_len == 4:
-            continue
-        
-        # 3. Buang nomor telepon yang masuk sebagai angka
-        # Nomor HP Indonesia normalized: 800 juta - 900 miliar (0.8B - 900B)
-        # Ini covers: 08xxxxxxxx (10 digit) sampai 08xxxxxxxxxxx (13 digit)
-        if 800_000_000 <= val <= 900_000_000_000:
-            continue
-        
-        # 4. CRITICAL: Buang angka TOTAL yang specific
-        if val in TOTAL_VALUES:
-            continue
-        
-        # 5. Ambil angka valid (>= 100 untuk cover SM kecil, < 1B max)
-        if val >= 100 and val < 1_000_000_000:
-            cleaned_nums.append(val)
-    
-    # Ambil 3 angka terakhir
-    if len(cleaned_nums) >= 3:
-        return (cleaned_nums[-3], cleaned_nums[-2], cleaned_nums[-1])
-    elif len(cleaned_nums) == 2:
-        return (cleaned_nums[-2], cleaned_nums[-1], 0)
-    elif len(cleaned_nums) == 1:
-        return (0, 0, cleaned_nums[-1])
-    return (0, 0, 0)
+    Filter: No_SBG (16 digit), nomor telepon, tahun (4 digit), angka TOTAL.
+    """
+    return JT_PARSER.amounts(JT_PARSER.tokenize(parse_text))
 
 # === (TIDAK DIUBAH) Kredit bermasalah functions ===
 def is_valid_record(rec: str) -> bool:
@@ -309,9 +413,10 @@ def extract_fields_from_record(rec: str):
         "sm": sm
     }
 
-def extract_nasabah_kb(rec: str, reader=None, img_path=None, bbox=None) -> str:
+def extract_nasabah_kb(rec: str, boxes=None) -> str:
     """
-    Dipertahankan tanpa ubahan (kredit_bermasalah).
+    Nama nasabah kredit_bermasalah dari teks record; jika regex gagal,
+    fallback ke box OCR halaman yang sama (tanpa baca/OCR ulang gambar).
     """
     rec = str(rec)
     m = re.search(r"\d{15,16}\s+\d{6,12}\s+(.*?)(?=\s+\d{2}-\d{2}-\d{4})", rec)
@@ -322,18 +427,45 @@ def extract_nasabah_kb(rec: str, reader=None, img_path=None, bbox=None) -> str:
     tokens = re.findall(r"[A-Z][A-Z\s\.,\-']{2,}", rec)
     if tokens:
         return tokens[0].strip()
-    if reader and img_path and bbox:
-        img = cv2.imread(img_path)
-        x1, y1, x2, y2 = bbox
-        crop = img[y1:y2, x1:x2]
-        gray = cv2.cvtColor(crop, cv2.COLOR_BGR2GRAY)
-        gray = cv2.resize(gray, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
-        _, thresh = cv2.threshold(gray, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
-        result = reader.readtext(thresh, detail=0, paragraph=True)
-        if result:
-            return " ".join(result).strip()
+    if boxes:
+        found = name_from_boxes(boxes, extract_no_sbg(rec))
+        if found:
+            return found[0]
     return "UNKNOWN_NASABAH"
 
+def sbg_box(boxes, no_sbg: str):
+    """Box OCR yang memuat No_SBG record ini ([bbox, teks, confidence]) atau None."""
+    if not no_sbg or not boxes:
+        return None
+    return next((b for b in boxes if no_sbg in re.sub(r"\D", "", str(b[1]))), None)
+
+def name_from_boxes(boxes, no_sbg: str):
+    """
+    Cari nama di baris yang sama dengan box No_SBG: box huruf kapital pertama
+    di kanan No_SBG. Return (nama, bbox, confidence) atau None.
+    """
+    anchor = sbg_box(boxes, no_sbg)
+    if anchor is None:
+        return None
+
+    ys = [p[1] for p in anchor[0]]
+    y_mid, half = (min(ys) + max(ys)) / 2, max((max(ys) - min(ys)) / 2, 1)
+    x_right = max(p[0] for p in anchor[0])
+
+    candidates = []
+    for bbox, text, conf in boxes:
+        by = [p[1] for p in bbox]
+        bx = min(p[0] for p in bbox)
+        if bx < x_right or abs((min(by) + max(by)) / 2 - y_mid) > half:
+            continue
+        m = re.search(r"[A-Z][A-Z\s\.,\-']{2,}", str(text))
+        if m:
+            candidates.append((bx, m.group(0).strip(), bbox, conf))
+    if not candidates:
+        return None
+    _, nama, bbox, conf = min(candidates, key=lambda c: c[0])
+    return nama, bbox, conf
+
 def extract_uang_pinjaman_sm_from_summary(full_text):
     m = re.search(r'Uang Pinjaman SM(.*)', full_text, re.IGNORECASE)
     if not m:
@@ -343,183 +475,539 @@ def extract_uang_pinjaman_sm_from_summary(full_text):
     sm_list = [normalize_number(a) for a in angka[1::2]]
     return uang_pinjaman_list, sm_list
 
-# === Process only for jatuh_tempo (plus kredit_bermasalah left intact) ===
-def process_doc_type(reader, doc_type: str):
-    input_dir = os.path.join(IMAGES_DIR, doc_type)
-    if not os.path.isdir(input_dir):
-        print(f"[WARN] Folder tidak ditemukan: {input_dir}")
-        return None, None
+def ocr_page_grid(reader, fname: str, fpath):
+    """
+    OCR jatuh_tempo mode grid: potong sel dari garis tabel lalu recognize per sel.
+    Return {"kind": "grid", "rows": index baris, "texts": (baris, kolom) → teks},
+    atau None jika gambar tidak bisa dibaca / OCR gagal.
+    """
+    gray = load_gray(fpath)
+    if gray is None:
+        print(f"[ERROR] Gambar tidak bisa dibaca: {fname}")
+        return None
+
+    cells = preprocessing_ocr.get_table_cells(gray)
+    texts = recognize_cells(reader, gray, cells)
+    if texts is None:
+        return None
+    return {"kind": "grid", "rows": sorted({row_idx for row_idx, _, _ in cells}), "texts": texts}
+
+def parse_page_grid(fname: str, payload):
+    """
+    Jatuh tempo mode grid: tiap baris tabel → satu record, tiap sel → field-nya.
+    """
+    if not payload:
+        return []
+    texts = payload["texts"]
 
-    files = sorted([
-        f for f in os.listdir(input_dir)
-        if f.lower().endswith((".png", ".jpg", ".jpeg"))
-    ])
-    if not files:
-        print(f"[WARN] Tidak ada file gambar di {input_dir}")
-        return None, None
+    rows = []
+    no_counter = 1
+    for row_idx in payload["rows"]:
+        no_sbg = re.sub(r"\D", "", texts.get((row_idx, "No_SBG"), ""))
+        if not 15 <= len(no_sbg) <= 16:
+            continue
 
+        nasabah = re.sub(r"^[\W_]+|[\W_]+$", "", texts.get((row_idx, "Nasabah"), "")).strip()
+        telp_tanggal = texts.get((row_idx, "Telp_Tanggal"), "")
+        tgl_kredit, tgl_jt = extract_tanggal_jt(telp_tanggal)
+        taksiran, uang_pinjaman, sm = extract_financial_triple_jt(texts.get((row_idx, "Nominal"), ""))
+
+        rows.append({
+            "filename": fname,
+            "No": no_counter,
+            "No_SBG": no_sbg,
+            "Nasabah": nasabah,
+            "Telp_HP": extract_telp_jt(telp_tanggal),
+            "Tgl_Kredit": tgl_kredit,
+            "Tgl_Jatuh_Tempo": tgl_jt,
+            "Taksiran": taksiran,
+            "Uang_Pinjaman": uang_pinjaman,
+            "SM": sm
+        })
+        no_counter += 1
+    return rows
+
+# === Process only for jatuh_tempo (plus kredit_bermasalah left intact) ===
+def ocr_page(reader, doc_type: str, fname: str, fpath, ocr_mode=OCR_MODE):
+    """
+    Tahap OCR satu halaman (tanpa ekstraksi record).
+    Return payload untuk parse_page: hasil sel (mode grid) atau box OCR halaman;
+    None jika OCR halaman ini gagal.
+    """
+    if doc_type == "jatuh_tempo" and ocr_mode == "grid":
+        return ocr_page_grid(reader, fname, fpath)
+    # Satu pass OCR box-level per halaman; teks paragraph diturunkan dari box yang sama
+    if ocr_mode == "adaptive":
+        boxes = extract_text_boxes_adaptive(reader, fpath, label=fname)
+    else:
+        boxes = extract_text_boxes(reader, fpath, label=fname)
+    if boxes is None:
+        return None
+    return {"kind": "boxes", "boxes": boxes}
+
+def parse_page(doc_type: str, fname: str, payload):
+    """
+    Tahap ekstraksi record dari payload ocr_page. Return list row (dict),
+    atau None jika OCR halaman gagal (payload None) supaya tidak di-journal.
+    """
+    if payload is None:
+        return None
+    if payload["kind"] == "grid":
+        return parse_page_grid(fname, payload)
+    boxes = payload["boxes"]
+    return parse_page_text(doc_type, fname, paragraph_text(boxes), boxes)
+
+def parse_page_text(doc_type: str, fname: str, full_text: str, boxes=None):
+    """
+    Ekstrak record dari teks OCR (paragraph) satu halaman.
+    boxes: hasil OCR box-level halaman ini (fallback nama kredit_bermasalah).
+    Return list row (dict) untuk halaman ini.
+    """
     rows = []
-    print(f"[INFO] Mulai proses {doc_type} ({len(files)} file)...")
-    for fname in tqdm(files, desc=f"OCR {doc_type}", unit="file"):
-        fpath = os.path.join(input_dir, fname)
-
-        if doc_type == "jatuh_tempo":
-            # NEW flow: Ambil semua teks di page, lalu split per No_SBG record
-            full_text = extract_text(reader, fpath)
-            
-            if not full_text.strip():
-                continue
-            
-            # CRITICAL: Remove TOTAL footer line before processing
-            # Strategy: Cut everything after last valid No_SBG record
-            # Find all No_SBG positions
-            sbg_matches = list(re.finditer(r'\b\d{15,16}\b', full_text))
-            if sbg_matches:
-                # Find the last No_SBG position
-                last_sbg_end = sbg_matches[-1].end()
-                # Find where this record likely ends (before "TOTAL" or "Di" signature)
-                tail_text = full_text[last_sbg_end:]
-                
-                # Find cutoff point (TOTAL, signature markers, or end of meaningful data)
-                cutoff_match = re.search(r'\b(TOTAL|Di\s+anggal|Dibuat\s+Oleh)', tail_text, re.IGNORECASE)
-                
-                if cutoff_match:
-                    # Keep only up to the last record (before TOTAL/signature)
-                    full_text = full_text[:last_sbg_end + cutoff_match.start()]
+    if doc_type == "jatuh_tempo":
+        # NEW flow: Ambil semua teks di page, lalu split per No_SBG record
+
+        if not full_text.strip():
+            return rows
+
+        # CRITICAL: Remove TOTAL footer line before processing
+        # Strategy: Cut everything after last valid No_SBG record
+        # Find all No_SBG positions
+        sbg_matches = list(re.finditer(r'\b\d{15,16}\b', full_text))
+        if sbg_matches:
+            # Find the last No_SBG position
+            last_sbg_end = sbg_matches[-1].end()
+            # Find where this record likely ends (before "TOTAL" or "Di" signature)
+            tail_text = full_text[last_sbg_end:]
+
+            # Find cutoff point (TOTAL, signature markers, or end of meaningful data)
+            cutoff_match = re.search(r'\b(TOTAL|Di\s+anggal|Dibuat\s+Oleh)', tail_text, re.IGNORECASE)
+
+            if cutoff_match:
+                # Keep only up to the last record (before TOTAL/signature)
+                full_text = full_text[:last_sbg_end + cutoff_match.start()]
+            else:
+                # No explicit cutoff found, look for pattern of last record ending
+                # Typically: No_SBG + name + phones + dates + 3 numbers
+                # Try to find where numbers stop being part of individual records
+                lines = tail_text.split('\n')
+                valid_lines = []
+                for line in lines:
+                    # Stop if line looks like footer/total
+                    if re.search(r'(TOTAL|^\s*\d{3},\d{3},\d{3}\s*$)', line, re.IGNORECASE):
+                        break
+                    valid_lines.append(line)
+                full_text = full_text[:last_sbg_end] + '\n'.join(valid_lines)
+
+        # Preprocessing: fix OCR errors dan separate concatenated names
+        parse_text = full_text
+        parse_text = re.sub(r"\s+", " ", parse_text)
+        parse_text = re.sub(r"(?<=[A-Za-z])(?=\d)", " ", parse_text)
+        parse_text = re.sub(r"(?<=\d)(?=[A-Za-z])", " ", parse_text)
+
+        # NEW STRATEGY: Split records individually dengan boundary yang lebih ketat
+        # Find all No_SBG positions first
+        sbg_positions = [(m.group(1), m.start(), m.end()) for m in re.finditer(r'(\d{15,16})', parse_text)]
+
+        if not sbg_positions:
+            return rows
+
+        no_counter = 1
+        for idx, (no_sbg, start_pos, end_pos) in enumerate(sbg_positions):
+            # Determine where this record ends
+            if idx + 1 < len(sbg_positions):
+                # Record ends just before next No_SBG
+                next_start = sbg_positions[idx + 1][1]
+                rec = parse_text[start_pos:next_start]
+            else:
+                # Last record - be very careful here!
+                # Strategy: Keep everything UNTIL we hit TOTAL keyword or signature
+                tail = parse_text[start_pos:]
+
+                # Look for TOTAL keyword or signature markers
+                cutoff_patterns = [
+                    r'\bTOTAL\b',
+                    r'Di\s+anggal',
+                    r'Dibuat\s+Oleh',
+                    r'KOTA\s+MANADO'
+                ]
+
+                cutoff_pos = None
+                for pattern in cutoff_patterns:
+                    match = re.search(pattern, tail, re.IGNORECASE)
+                    if match:
+                        if cutoff_pos is None or match.start() < cutoff_pos:
+                            cutoff_pos = match.start()
+
+                if cutoff_pos:
+                    rec = tail[:cutoff_pos]
                 else:
-                    # No explicit cutoff found, look for pattern of last record ending
-                    # Typically: No_SBG + name + phones + dates + 3 numbers
-                    # Try to find where numbers stop being part of individual records
-                    lines = tail_text.split('\n')
-                    valid_lines = []
-                    for line in lines:
-                        # Stop if line looks like footer/total
-                        if re.search(r'(TOTAL|^\s*\d{3},\d{3},\d{3}\s*$)', line, re.IGNORECASE):
-                            break
-                        valid_lines.append(line)
-                    full_text = full_text[:last_sbg_end] + '\n'.join(valid_lines)
-            
-            # Preprocessing: fix OCR errors dan separate concatenated names
-            parse_text = full_text
-            parse_text = re.sub(r"\s+", " ", parse_text)
-            parse_text = re.sub(r"(?<=[A-Za-z])(?=\d)", " ", parse_text)
-            parse_text = re.sub(r"(?<=\d)(?=[A-Za-z])", " ", parse_text)
-            
-            # NEW STRATEGY: Split records individually dengan boundary yang lebih ketat
-            # Find all No_SBG positions first
-            sbg_positions = [(m.group(1), m.start(), m.end()) for m in re.finditer(r'(\d{15,16})', parse_text)]
-            
-            if not sbg_positions:
+                    rec = tail
+
+            rec = clean_whitespace(rec)
+
+            # Skip if record is too short or looks like footer
+            if len(rec) < 20 or re.search(r'\bTOTAL\b', rec, re.IGNORECASE):
                 continue
-            
-            no_counter = 1
-            for idx, (no_sbg, start_pos, end_pos) in enumerate(sbg_positions):
-                # Determine where this record ends
-                if idx + 1 < len(sbg_positions):
-                    # Record ends just before next No_SBG
-                    next_start = sbg_positions[idx + 1][1]
-                    rec = parse_text[start_pos:next_start]
-                else:
-                    # Last record - be very careful here!
-                    # Strategy: Keep everything UNTIL we hit TOTAL keyword or signature
-                    tail = parse_text[start_pos:]
-                    
-                    # Look for TOTAL keyword or signature markers
-                    cutoff_patterns = [
-                        r'\bTOTAL\b',
-                        r'Di\s+anggal',
-                        r'Dibuat\s+Oleh',
-                        r'KOTA\s+MANADO'
-                    ]
-                    
-                    cutoff_pos = None
-                    for pattern in cutoff_patterns:
-                        match = re.search(pattern, tail, re.IGNORECASE)
-                        if match:
-                            if cutoff_pos is None or match.start() < cutoff_pos:
-                                cutoff_pos = match.start()
-                    
-                    if cutoff_pos:
-                        rec = tail[:cutoff_pos]
-                    else:
-                        rec = tail
-                
-                rec = clean_whitespace(rec)
-                
-                # Skip if record is too short or looks like footer
-                if len(rec) < 20 or re.search(r'\bTOTAL\b', rec, re.IGNORECASE):
-                    continue
-                
-                # Verify No_SBG matches
-                extracted_sbg = extract_no_sbg(rec)
-                if extracted_sbg != no_sbg:
-                    continue
-                
-                # Extract fields
-                nasabah = extract_nasabah_jt(rec)
-                telp_hp = extract_telp_jt(rec)
-                tgl_kredit, tgl_jt = extract_tanggal_jt(rec)
-                taksiran, uang_pinjaman, sm = extract_financial_triple_jt(rec)
-
-                rows.append({
-                    "filename": fname,
-                    "No": no_counter,
-                    "No_SBG": no_sbg,
-                    "Nasabah": nasabah,
-                    "Telp_HP": telp_hp,
-                    "Tgl_Kredit": tgl_kredit,
-                    "Tgl_Jatuh_Tempo": tgl_jt,
-                    "Taksiran": taksiran,
-                    "Uang_Pinjaman": uang_pinjaman,
-                    "SM": sm
-                })
-                no_counter += 1
 
-        else:
-            # KREDIT BERMASALAH: flow lama dipertahankan (tidak diutak-atik)
-            full_text = extract_text(reader, fpath)
-
-            if not full_text.strip():
-                rows.append({
-                    "filename": fname,
-                    "no": 0,
-                    "raw_text": "",
-                    "no_sbg": "",
-                    "taksiran": 0,
-                    "uang_pinjaman": 0,
-                    "sm": 0,
-                    "nasabah": "" if doc_type == "kredit_bermasalah" else None
-                })
+            # Extract fields (satu tokenize per record), verify No_SBG matches
+            fields = JT_PARSER.parse(rec)
+            if fields["No_SBG"] != no_sbg:
+                continue
+
+            rows.append({"filename": fname, "No": no_counter, **fields})
+            no_counter += 1
+
+    else:
+        # KREDIT BERMASALAH: flow lama dipertahankan (tidak diutak-atik)
+        if not full_text.strip():
+            rows.append({
+                "filename": fname,
+                "no": 0,
+                "raw_text": "",
+                "no_sbg": "",
+                "taksiran": 0,
+                "uang_pinjaman": 0,
+                "sm": 0,
+                "nasabah": "" if doc_type == "kredit_bermasalah" else None
+            })
+            return rows
+
+        records = split_nasabah_records(full_text)
+        uang_pinjaman_list, sm_list = extract_uang_pinjaman_sm_from_summary(full_text)
+        for i, rec in enumerate(records, start=1):
+            no_sbg = extract_no_sbg(rec)
+            nasabah = extract_nasabah_kb(rec, boxes=boxes)
+
+            if nasabah == "UNKNOWN_NASABAH":
+                anchor = sbg_box(boxes, no_sbg)
+                DIAGNOSTICS.record(
+                    doc_type, fname, get_page_from_filename(fname), i, "nasabah",
+                    no_sbg=no_sbg,
+                    bbox=anchor[0] if anchor else None,
+                    confidence=anchor[2] if anchor else None,
+                    raw_text=rec,
+                )
+
+            uang_pinjaman = uang_pinjaman_list[i-1] if i-1 < len(uang_pinjaman_list) else 0
+            sm = sm_list[i-1] if i-1 < len(sm_list) else 0
+            rows.append({
+                "filename": fname,
+                "no": i,
+                "raw_text": rec,
+                "no_sbg": no_sbg,
+                "nasabah": nasabah,
+                "taksiran": 0,
+                "uang_pinjaman": uang_pinjaman,
+                "sm": sm
+            })
+
+    return rows
+
+
+def iter_page_ocr(reader, doc_type: str, items, ocr_mode=OCR_MODE, batch_size=OCR_BATCH_SIZE):
+    """
+    Generator (fname, payload) hasil OCR tiap halaman di items (lihat ocr_page).
+    Mode "batched": halaman dikelompokkan per ukuran lalu di-OCR per batch_size
+    halaman sekaligus; urutan yield mengikuti batch, bukan urutan items.
+    """
+    if ocr_mode != "batched":
+        for fname, fpath in items:
+            yield fname, ocr_page(reader, doc_type, fname, fpath, ocr_mode)
+        return
+
+    groups = {}
+    for fname, fpath in items:
+        groups.setdefault(image_shape(fpath), []).append((fname, fpath))
+
+    for group in groups.values():
+        for start in range(0, len(group), batch_size):
+            chunk = [(fname, load_gray(fpath)) for fname, fpath in group[start:start + batch_size]]
+            readable = [(fname, img) for fname, img in chunk if img is not None]
+            page_boxes = {}
+            if readable:
+                batch_boxes = extract_boxes_batched(reader, [img for _, img in readable], batch_size)
+                page_boxes = dict(zip([fname for fname, _ in readable], batch_boxes))
+            for fname, _ in chunk:
+                boxes = page_boxes.get(fname)
+                yield fname, None if boxes is None else {"kind": "boxes", "boxes": boxes}
+
+def iter_page_rows(reader, doc_type: str, items, ocr_mode=OCR_MODE, batch_size=OCR_BATCH_SIZE):
+    """
+    Generator (fname, rows): OCR lalu ekstraksi record berurutan dalam satu thread.
+    rows None berarti OCR halaman gagal (lihat parse_page).
+    """
+    for fname, payload in iter_page_ocr(reader, doc_type, items, ocr_mode, batch_size):
+        yield fname, parse_page(doc_type, fname, payload)
+
+def iter_page_rows_pipelined(reader, doc_type: str, items, ocr_mode=OCR_MODE,
+                             parse_workers=PARSE_WORKERS, queue_size=PARSE_QUEUE_SIZE):
+    """
+    Seperti iter_page_rows, tapi OCR (producer) jalan di thread sendiri dan
+    ekstraksi record (consumer) di thread pool, dihubungkan antrian terbatas.
+    Paling banyak queue_size halaman menunggu di antrian + queue_size sedang di-parse.
+    Jika generator ditinggal di tengah jalan (exception di pemanggil, rerun
+    Streamlit), stop event di-set dan antrian dikosongkan supaya producer berhenti.
+    """
+    pages = queue.Queue(maxsize=queue_size)
+    done = object()
+    stop = threading.Event()
+    errors = []
+
+    def put(item):
+        # put dengan timeout supaya producer tidak menunggu selamanya setelah stop
+        while not stop.is_set():
+            try:
+                pages.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce():
+        try:
+            for item in iter_page_ocr(reader, doc_type, items, ocr_mode):
+                if not put(item):
+                    return
+        except Exception as e:
+            errors.append(e)
+        finally:
+            put(done)
+
+    producer = threading.Thread(target=produce, name=f"ocr-{doc_type}", daemon=True)
+    producer.start()
+
+    pending = []
+    finished = False
+    pool = ThreadPoolExecutor(max_workers=parse_workers)
+    try:
+        while True:
+            item = pages.get()
+            if item is done:
+                break
+            fname, payload = item
+            pending.append((fname, pool.submit(parse_page, doc_type, fname, payload)))
+            # Yield halaman yang sudah selesai; tahan producer jika parsing tertinggal
+            while pending and (pending[0][1].done() or len(pending) >= queue_size):
+                fname, future = pending.pop(0)
+                yield fname, future.result()
+        for fname, future in pending:
+            yield fname, future.result()
+        finished = True
+    finally:
+        stop.set()
+        while True:
+            try:
+                pages.get_nowait()
+            except queue.Empty:
+                break
+        pool.shutdown(wait=finished, cancel_futures=not finished)
+
+    producer.join()
+    if errors:
+        raise errors[0]
+
+# === Multi-process OCR ===
+_worker_reader = None
+
+def _init_ocr_worker(torch_threads: int):
+    """Initializer worker: batasi thread torch lalu load Reader sekali per proses."""
+    global _worker_reader
+    try:
+        import torch
+        torch.set_num_threads(torch_threads)
+    except Exception:
+        pass
+    cv2.setNumThreads(1)
+    _worker_reader = get_reader()
+
+def _ocr_shard(doc_type: str, shard, ocr_mode=OCR_MODE):
+    """
+    OCR + ekstraksi record (iter_page_rows) untuk satu shard (list (fname, fpath)) di worker.
+    Return (list (fname, rows), event diagnostics worker untuk shard ini).
+    """
+    results = list(iter_page_rows(_worker_reader, doc_type, shard, ocr_mode))
+    return results, DIAGNOSTICS.drain()
+
+# Pool worker dipertahankan antar run (key: jumlah worker) → model tetap hangat
+_OCR_POOLS = {}
+
+def get_ocr_pool(workers: int) -> ProcessPoolExecutor:
+    pool = _OCR_POOLS.get(workers)
+    if pool is None:
+        torch_threads = max(1, (os.cpu_count() or 1) // workers)
+        pool = ProcessPoolExecutor(max_workers=workers, mp_context=mp.get_context("spawn"),
+                                   initializer=_init_ocr_worker, initargs=(torch_threads,))
+        _OCR_POOLS[workers] = pool
+    return pool
+
+def shutdown_ocr_pools():
+    for pool in _OCR_POOLS.values():
+        pool.shutdown(wait=False, cancel_futures=True)
+    _OCR_POOLS.clear()
+
+atexit.register(shutdown_ocr_pools)
+
+def _process_items_parallel(doc_type: str, items, workers: int, ocr_mode=OCR_MODE, on_page=None):
+    """
+    Bagi items ke beberapa shard kecil untuk `workers` proses, tiap worker punya Reader sendiri.
+    Shard kecil (1 halaman, atau OCR_BATCH_SIZE untuk mode batched) → hasil tiap halaman
+    langsung kembali ke proses utama dan bisa di-journal lewat on_page(fname, rows);
+    rows None untuk halaman yang OCR-nya gagal.
+    Row digabung ulang sesuai urutan nama file → identik dengan jalur serial.
+    """
+    shard_size = OCR_BATCH_SIZE if ocr_mode == "batched" else 1
+    shards = [items[i:i + shard_size] for i in range(0, len(items), shard_size)]
+
+    page_rows = {}
+    executor = get_ocr_pool(workers)
+    try:
+        futures = [executor.submit(_ocr_shard, doc_type, shard, ocr_mode) for shard in shards]
+        with tqdm(total=len(items), desc=f"OCR {doc_type} ({workers} worker)", unit="file") as pbar:
+            for future in as_completed(futures):
+                results, events = future.result()
+                DIAGNOSTICS.extend(events)
+                for fname, rows in results:
+                    page_rows[fname] = rows
+                    if on_page:
+                        on_page(fname, rows)
+                    pbar.update(1)
+    except BrokenProcessPool:
+        # Worker mati (mis. kehabisan memori) → buang pool supaya run berikutnya membuat ulang
+        _OCR_POOLS.pop(workers, None)
+        raise
+
+    return page_rows
+
+# === Journal / checkpoint OCR ===
+def page_signature(fpath) -> str:
+    """
+    Sidik halaman: sha256 isi file, atau sha256 piksel untuk array in-memory.
+    Sengaja bukan mtime: run_preprocessing menulis ulang semua gambar (render ulang
+    atau salin dari cache halaman) sebelum OCR, jadi mtime selalu berubah.
+    """
+    if isinstance(fpath, str):
+        return preprocessing_ocr.file_sha256(fpath)
+    return hashlib.sha256(fpath.tobytes()).hexdigest()
+
+def load_journal(journal_path: str) -> dict:
+    """Baca journal JSONL → {fname: entry}. Baris terakhir yang terpotong (crash) diabaikan."""
+    done = {}
+    if not os.path.exists(journal_path):
+        return done
+    with open(journal_path, encoding="utf-8") as f:
+        for line in f:
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
                 continue
+            done[entry["fname"]] = entry
+    return done
+
+class PageJournal:
+    """Append hasil per halaman ke JSONL begitu selesai (flush + fsync)."""
+
+    def __init__(self, journal_path: str, ocr_mode: str, signatures: dict, resume=False):
+        self.ocr_mode = ocr_mode
+        self.signatures = signatures
+        self.f = open(journal_path, "a" if resume else "w", encoding="utf-8")
 
-            records = split_nasabah_records(full_text)
-            uang_pinjaman_list, sm_list = extract_uang_pinjaman_sm_from_summary(full_text)
-            for i, rec in enumerate(records, start=1):
-                no_sbg = extract_no_sbg(rec)
-                nasabah = extract_nasabah_kb(rec, reader=reader, img_path=fpath, bbox=None)
-
-                if nasabah == "UNKNOWN_NASABAH":
-                    with open(MISSING_NAMES_LOG, "a", encoding="utf-8-sig") as f:
-                        f.write(f"{fname},{i},{rec}\n")
-
-                uang_pinjaman = uang_pinjaman_list[i-1] if i-1 < len(uang_pinjaman_list) else 0
-                sm = sm_list[i-1] if i-1 < len(sm_list) else 0
-                rows.append({
-                    "filename": fname,
-                    "no": i,
-                    "raw_text": rec,
-                    "no_sbg": no_sbg,
-                    "nasabah": nasabah,
-                    "taksiran": 0,
-                    "uang_pinjaman": uang_pinjaman,
-                    "sm": sm
-                })
+    def write(self, fname: str, rows):
+        entry = {"fname": fname, "sig": self.signatures[fname], "mode": self.ocr_mode, "rows": rows}
+        self.f.write(json.dumps(entry, ensure_ascii=False, default=str) + "\n")
+        self.f.flush()
+        os.fsync(self.f.fileno())
+
+    def close(self):
+        self.f.close()
+
+def process_doc_type(reader, doc_type: str, images=None, workers=OCR_WORKERS, ocr_mode=OCR_MODE,
+                     resume=False):
+    """
+    OCR semua gambar doc_type lalu ekstrak record-nya ke CSV raw_ocr.
+    images: list (nama_file, array) dari run_preprocessing(write_images=False);
+    jika None, gambar dibaca dari folder images/<doc_type>.
+    workers > 1: OCR dibagi ke beberapa proses (reader boleh None).
+    ocr_mode: "full", "grid", "batched" atau "adaptive" (lihat OCR_MODE).
+    resume: lewati halaman yang sudah tercatat di journal run sebelumnya
+    (nama file, sidik gambar & ocr_mode sama); tanpa resume journal dimulai ulang.
+    Halaman yang OCR-nya gagal tidak di-journal, jadi dicoba lagi saat resume.
+    """
+    if images is None:
+        input_dir = os.path.join(IMAGES_DIR, doc_type)
+        if not os.path.isdir(input_dir):
+            print(f"[WARN] Folder tidak ditemukan: {input_dir}")
+            return None, None
+
+        files = sorted([
+            f for f in os.listdir(input_dir)
+            if f.lower().endswith((".png", ".jpg", ".jpeg"))
+        ])
+        items = [(f, os.path.join(input_dir, f)) for f in files]
+    else:
+        items = sorted(images, key=lambda item: item[0])
+
+    if not items:
+        print(f"[WARN] Tidak ada gambar untuk {doc_type}")
+        return None, None
+
+    journal_path = JOURNAL_TEMPLATE.format(doc_type=doc_type)
+    signatures = {fname: page_signature(fpath) for fname, fpath in items}
+    page_rows = {}
+    if resume:
+        for fname, entry in load_journal(journal_path).items():
+            if entry.get("sig") == signatures.get(fname) and entry.get("mode") == ocr_mode:
+                page_rows[fname] = entry["rows"]
+        if page_rows:
+            print(f"[INFO] Resume {doc_type}: {len(page_rows)} halaman sudah ada di journal, dilewati")
+    todo = [(fname, fpath) for fname, fpath in items if fname not in page_rows]
+
+    DIAGNOSTICS.drain()  # buang sisa event dari run yang gagal sebelumnya
+    print(f"[INFO] Mulai proses {doc_type} ({len(todo)} file)...")
+    started = time.perf_counter()
+    journal = PageJournal(journal_path, ocr_mode, signatures, resume=resume)
+    failed = []
+
+    def record_page(fname, rows):
+        if rows is None:
+            failed.append(fname)
+        else:
+            journal.write(fname, rows)
+
+    try:
+        # workers > 1 → selalu lewat pool, juga untuk 1 halaman (pemanggil tidak
+        # membuat reader di proses utama pada mode ini)
+        if workers > 1 and todo:
+            page_rows.update(_process_items_parallel(doc_type, todo, workers, ocr_mode,
+                                                     on_page=record_page))
+        elif todo:
+            if reader is None:
+                reader = get_reader()
+            pages = iter_page_rows_pipelined(reader, doc_type, todo, ocr_mode)
+            for fname, rows in tqdm(pages, total=len(todo), desc=f"OCR {doc_type}", unit="file"):
+                page_rows[fname] = rows
+                record_page(fname, rows)
+    finally:
+        journal.close()
+    rows = [row for fname, _ in items for row in page_rows.get(fname) or []]
+    if failed:
+        print(f"[WARN] OCR gagal untuk {len(failed)} halaman {doc_type} (tidak di-journal, "
+              f"jalankan ulang dengan resume): {', '.join(sorted(failed))}")
+
+    elapsed = time.perf_counter() - started
+    print(f"[INFO] OCR {doc_type}: {len(todo)} halaman dalam {elapsed:.1f} detik "
+          f"({len(todo) / max(elapsed, 1e-9):.2f} halaman/detik, mode={ocr_mode}, workers={workers})")
+
+    missing_log = MISSING_NAMES_TEMPLATE.format(doc_type=doc_type)
+    n_events = DIAGNOSTICS.flush(missing_log)
+    if n_events:
+        print(f"[INFO] {n_events} field hilang dicatat di {missing_log}")
 
     # Export hasil OCR
     df = pd.DataFrame(rows)
     stamp = dt.datetime.now().strftime("%Y%m%d")
     out_path = os.path.join(OUTPUT_DIR, f"{doc_type}_raw_{stamp}.csv")
-    df.to_csv(out_path, index=False, encoding="utf-8-sig")
+    out_path = artifacts.save_artifact(df, out_path, kind="raw_ocr")
     print(f"[INFO] Hasil {doc_type} disimpan: {out_path}")
     return df, out_path
 
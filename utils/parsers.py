@@ -1,23 +1,24 @@
 import os
-import json
 import pandas as pd
 import sys
 import urllib.parse
 import re
-from openpyxl import load_workbook
+import string
+import functools
+import warnings
+from openpyxl import Workbook
+from openpyxl.cell import WriteOnlyCell
 from openpyxl.utils import get_column_letter
-from openpyxl.worksheet.table import Table, TableStyleInfo
+from openpyxl.worksheet.filters import AutoFilter
+from openpyxl.worksheet.table import Table, TableColumn, TableStyleInfo
 from openpyxl.styles import Alignment
 
 
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from utils.artifacts import read_artifact, save_artifact, latest_artifact
 
-# === Load config struktur field ===
-with open("config/struktur_fields.json", "r", encoding="utf-8") as f:
-    STRUCT_FIELDS = json.load(f)
-
-with open("config/templates.json", "r", encoding="utf-8") as f:
-    TEMPLATES = json.load(f)
+# === Config struktur field & template (cache + hot reload, lihat config_loader) ===
+from utils.config_loader import load_struct_fields, get_template
 
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))  # root project
 CLEAN_DIR = os.path.join(BASE_DIR, "output", "cleaned")
@@ -29,8 +30,8 @@ os.makedirs(MSG_DIR, exist_ok=True)
 
 # ---- Helper ----
 def latest_csv(prefix, path):
-    files = [os.path.join(path, f) for f in os.listdir(path) if f.startswith(prefix) and f.endswith(".csv")]
-    return max(files, key=os.path.getmtime) if files else None
+    """Artefak (CSV / Parquet) terbaru berawalan prefix."""
+    return latest_artifact(prefix, path)
 
 def normalize_money(v):
     """Format angka jadi rupiah pakai titik sebagai pemisah ribuan"""
@@ -51,44 +52,78 @@ def normalize_phone(v):
         s = "0" + s
     return s
 
-def autosize_and_format_excel(path, table_name="DataTable"):
-    """Atur lebar kolom, wrap text di kolom message, & jadikan tabel di Excel"""
-    wb = load_workbook(path)
-    ws = wb.active
-    max_row = ws.max_row
-    max_col = ws.max_column
-    table_range = f"A1:{get_column_letter(max_col)}{max_row}"
+def normalize_moneys(values: pd.Series) -> pd.Series:
+    """Versi kolom normalize_money: "1500000" → "1.500.000", kosong → ""."""
+    text = values.where(values.notna(), "").astype(str).str.strip()
+    digits = text.str.replace(r"[^\d]", "", regex=True)
+    trimmed = digits.str.lstrip("0")
+    trimmed = trimmed.where(trimmed.ne("") | digits.eq(""), "0")
+    return trimmed.str.replace(r"(\d)(?=(?:\d{3})+$)", r"\1.", regex=True)
+
+def normalize_phones(values: pd.Series) -> pd.Series:
+    """Versi kolom normalize_phone."""
+    text = values.where(values.notna(), "").astype(str).str.strip()
+    return text.where(text.eq("") | text.str.startswith("0"), "0" + text)
+
+MESSAGE_COL_WIDTH = 60
+
+def write_messages_excel(df, path, table_name="DataTable"):
+    """
+    Tulis DataFrame ke XLSX dalam satu pass (openpyxl write_only): lebar kolom
+    dihitung dulu dari panjang string, kolom message di-wrap, dan tabel Excel
+    dipasang saat menulis (tanpa to_excel lalu memuat ulang workbook).
+    Lebar kolom: nilai/header terpanjang + 2; kolom message lebar tetap 60.
+    """
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Sheet1")  # nama sheet sama dengan to_excel
+    headers = [str(c) for c in df.columns]
+    if not headers:
+        wb.save(path)
+        return
 
-    # Buat tabel resmi Excel
+    values = df.astype(object).where(df.notna(), None)
+    wrap = Alignment(wrap_text=True, vertical="top")
+    wrap_idx = {i for i, h in enumerate(headers) if h.lower() == "message"}
+
+    # Lebar kolom dari panjang string (header ikut dihitung), message lebar fix
+    for i, h in enumerate(headers):
+        letter = get_column_letter(i + 1)
+        if i in wrap_idx:
+            ws.column_dimensions[letter].width = MESSAGE_COL_WIDTH
+            continue
+        col = values.iloc[:, i]
+        lengths = col[col.astype(bool)].astype(str).str.len()
+        max_length = max(len(h), int(lengths.max()) if not lengths.empty else 0)
+        ws.column_dimensions[letter].width = max_length + 2
+
+    # Tabel resmi Excel (kolom tabel diisi eksplisit; write_only tidak bisa baca header)
+    table_range = f"A1:{get_column_letter(len(headers))}{len(df) + 1}"
     tab = Table(displayName=table_name, ref=table_range)
-    style = TableStyleInfo(
+    tab.tableColumns = [TableColumn(id=i + 1, name=h) for i, h in enumerate(headers)]
+    tab.autoFilter = AutoFilter(ref=table_range)
+    tab.tableStyleInfo = TableStyleInfo(
         name="TableStyleMedium9",
         showFirstColumn=False,
         showLastColumn=False,
         showRowStripes=True,
         showColumnStripes=False,
     )
-    tab.tableStyleInfo = style
-    ws.add_table(tab)
-
-    # Auto-resize kolom & wrap text khusus untuk kolom message
-    for col in ws.columns:
-        col_letter = get_column_letter(col[0].column)
-        header = str(col[0].value).lower() if col[0].value else ""
-
-        if header == "message":
-            # wrap text untuk kolom message
-            for cell in col:
-                cell.alignment = Alignment(wrap_text=True, vertical="top")
-            ws.column_dimensions[col_letter].width = 60  # kasih lebar fix supaya enak dibaca
-        else:
-            # auto-width untuk kolom lain
-            max_length = 0
-            for cell in col:
-                if cell.value:
-                    max_length = max(max_length, len(str(cell.value)))
-            ws.column_dimensions[col_letter].width = max_length + 2
-
+    # openpyxl selalu memberi warning ini di mode write_only, kolom tabel sudah diisi di atas
+    with warnings.catch_warnings():
+        warnings.filterwarnings("ignore", message="In write-only mode you must add table columns manually")
+        ws.add_table(tab)
+
+    def styled(row):
+        cells = list(row)
+        for i in wrap_idx:
+            cell = WriteOnlyCell(ws, value=cells[i])
+            cell.alignment = wrap
+            cells[i] = cell
+        return cells
+
+    ws.append(styled(headers))
+    for row in values.itertuples(index=False, name=None):
+        ws.append(styled(row))
     wb.save(path)
 
 def normalize_column_names(df):
@@ -116,10 +151,46 @@ def normalize_column_names(df):
     
     return df.rename(columns=column_mapping)
 
+@functools.lru_cache(maxsize=32)
+def compile_template(template):
+    """
+    Pecah template sekali jadi segmen (literal, field). Return None jika template
+    memakai format lanjutan (format spec, !r/!s, indeks/atribut, field posisional);
+    template seperti itu dirender per baris dengan str.format.
+    """
+    segments = []
+    for literal, field, spec, conversion in string.Formatter().parse(template):
+        if field is not None and (spec or conversion or not field or field.isdigit()
+                                  or "." in field or "[" in field):
+            return None
+        segments.append((literal, field))
+    return tuple(segments)
+
+def render_messages(df, segments):
+    """
+    Render message + versi URL-encoded-nya per kolom (tanpa iterrows).
+    quote() bekerja per karakter, jadi quote(a + b) == quote(a) + quote(b):
+    literal di-encode sekali, nilai field di-encode per nilai unik.
+    """
+    msg = pd.Series("", index=df.index, dtype=object)
+    encoded = msg.copy()
+    for literal, field in segments:
+        if literal:
+            msg = msg + literal
+            encoded = encoded + urllib.parse.quote(literal)
+        if field is None:
+            continue
+        if field not in df.columns:
+            raise KeyError(field)
+        text = df[field].astype(str)
+        quoted = {v: urllib.parse.quote(v) for v in pd.unique(text)}
+        msg = msg + text
+        encoded = encoded + text.map(quoted)
+    return msg, encoded
+
 def generate_messages(df, doc_type):
     """Generate pesan WhatsApp sesuai template"""
-    template = TEMPLATES.get(doc_type, "")
-    messages = []
+    template = get_template(doc_type)
 
     # Normalisasi nama kolom ke UPPERCASE untuk template
     df = normalize_column_names(df)
@@ -127,13 +198,37 @@ def generate_messages(df, doc_type):
     # SORTING: Urutkan berdasarkan UANG_PINJAMAN dari terbesar ke terkecil
     if "UANG_PINJAMAN" in df.columns:
         # Convert ke numeric untuk sorting yang benar
-        df["UANG_PINJAMAN_NUMERIC"] = df["UANG_PINJAMAN"].apply(
-            lambda x: int(re.sub(r"[^\d]", "", str(x))) if pd.notna(x) and str(x).strip() else 0
-        )
+        digits = df["UANG_PINJAMAN"].astype(str).str.replace(r"[^\d]", "", regex=True)
+        df["UANG_PINJAMAN_NUMERIC"] = pd.to_numeric(
+            digits.where(df["UANG_PINJAMAN"].notna() & digits.ne("")), errors="coerce"
+        ).fillna(0)
         df = df.sort_values("UANG_PINJAMAN_NUMERIC", ascending=False)
         df = df.drop("UANG_PINJAMAN_NUMERIC", axis=1)
         print(f"[INFO] Messages diurutkan berdasarkan Uang Pinjaman (terbesar → terkecil)")
 
+    segments = compile_template(template)
+    if segments is None:
+        return _render_rows(df, template)
+    if df.empty:
+        return pd.DataFrame([])
+
+    df = df.reset_index(drop=True)
+    if "TELP_HP" in df.columns:
+        df["TELP_HP"] = normalize_phones(df["TELP_HP"])
+    if "UANG_PINJAMAN" in df.columns:
+        df["UANG_PINJAMAN"] = normalize_moneys(df["UANG_PINJAMAN"])
+
+    msg, encoded = render_messages(df, segments)
+    hp = df["TELP_HP"] if "TELP_HP" in df.columns else pd.Series("", index=df.index)
+    has_hp = hp.ne("")
+    wa_me = ("https://wa.me/" + hp + "?text=" + encoded).where(has_hp, "")
+    wa_web = ("https://web.whatsapp.com/send?phone=" + hp + "&text=" + encoded).where(has_hp, "")
+
+    return pd.DataFrame({"message": msg, "wa_me": wa_me, "wa_web": wa_web})
+
+def _render_rows(df, template):
+    """Render per baris (str.format) untuk template dengan format lanjutan."""
+    messages = []
     for _, r in df.iterrows():
         row = r.to_dict()
         if "TELP_HP" in row:
@@ -158,13 +253,19 @@ def parse_document(doc_type):
         return
 
     print(f"[INFO] Parsing {doc_type} dari {csv_file}")
-    df = pd.read_csv(csv_file, encoding="utf-8-sig", dtype=str)
-
+    df = read_artifact(csv_file, as_str=True)
+    return parse_dataframe(df, doc_type)
+
+def parse_dataframe(df, doc_type):
+    """
+    Ekstrak field sesuai struktur + generate messages dari DataFrame hasil cleaning
+    (kolom string). Hasil extracted & messages tetap ditulis ke parsed_output / messages.
+    """
     # Normalisasi nama kolom ke UPPERCASE
     df = normalize_column_names(df)
 
     # Ambil field yang dibutuhkan sesuai config
-    expected_fields = STRUCT_FIELDS.get(doc_type, [])
+    expected_fields = load_struct_fields().get(doc_type, [])
     
     # Filter hanya kolom yang ada di dataframe
     available_fields = [f for f in expected_fields if f in df.columns]
@@ -178,19 +279,18 @@ def parse_document(doc_type):
 
     # normalisasi isi
     if "TELP_HP" in df_extracted.columns:
-        df_extracted["TELP_HP"] = df_extracted["TELP_HP"].apply(normalize_phone)
+        df_extracted["TELP_HP"] = normalize_phones(df_extracted["TELP_HP"])
     if "UANG_PINJAMAN" in df_extracted.columns:
-        df_extracted["UANG_PINJAMAN"] = df_extracted["UANG_PINJAMAN"].apply(normalize_money)
+        df_extracted["UANG_PINJAMAN"] = normalize_moneys(df_extracted["UANG_PINJAMAN"])
 
     # simpan extracted ke CSV (parsed_output)
     out_csv = os.path.join(OUT_DIR, f"{doc_type}_extracted.csv")
-    df_extracted.to_csv(out_csv, index=False, encoding="utf-8-sig")
+    out_csv = save_artifact(df_extracted, out_csv, kind="parsed")
 
     # simpan messages ke XLSX (SUDAH DISORT DI DALAM generate_messages)
     df_messages = generate_messages(df_extracted, doc_type)
     out_msg_xlsx = os.path.join(MSG_DIR, f"{doc_type}_messages.xlsx")
-    df_messages.to_excel(out_msg_xlsx, index=False, engine="openpyxl")
-    autosize_and_format_excel(out_msg_xlsx, f"{doc_type}_messages")
+    write_messages_excel(df_messages, out_msg_xlsx, f"{doc_type}_messages")
 
     print(f"[OK] Hasil {doc_type} tersimpan → extracted: {out_csv}, messages: {out_msg_xlsx}")
     return df_extracted.head()
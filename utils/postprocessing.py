@@ -1,7 +1,11 @@
 import re
 import os
+import sys
 import pandas as pd
 
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from utils.artifacts import read_artifact, save_artifact, latest_artifact
+
 # === Helper umum ===
 def normalize_number(num_str):
     """Bersihkan angka dari karakter non-digit."""
@@ -11,6 +15,31 @@ def normalize_number(num_str):
     return int(clean) if clean else None
 
 
+def normalize_numbers(values: pd.Series) -> pd.Series:
+    """Versi kolom normalize_number → Int64 nullable (kosong/tanpa digit → <NA>)."""
+    digits = values.astype("string").str.replace(r"[^\d]", "", regex=True)
+    digits = digits.where((digits.ne("") & (digits.str.len() <= 18)).fillna(False))
+    return pd.to_numeric(digits, errors="coerce").astype("Int64")
+
+
+# Pola gelar/akronim di-compile sekali (dipakai normalize_name & normalize_names)
+_TITLE_RE = re.compile(
+    r"\b("
+    r"dr\.?|drs\.?|dr_?|prof\.?|ir\.?|h\.?|kh\.?|tgk\.?|r\.?|hr\.?|se\.?|kt\.?|mm\.?|s\.e\.?|m\.m\.?|"
+    r"s\.farm\.?|m\.farm\.?|s\.ked\.?|s\.kom\.?|m\.kom\.?|s\.si\.?|m\.si\.?|s\.pd\.?|m\.pd\.?|"
+    r"s\.os\.?|m\.os\.?|s\.gz\.?|s\.t\.?|m\.ak\.?|apt\.?|sp\.[a-z]*|spt|spd|"
+    r"[A-Z]\s+[A-Z]{1,3}"  # pola seperti M TI
+    r")\b",
+    flags=re.IGNORECASE
+)
+_PUNCT_RE = re.compile(r"[\"',.;:-]+")
+_SPACE_RE = re.compile(r"\s+")
+
+# Memo nama → hasil normalisasi (nasabah yang sama muncul di banyak laporan)
+_NAME_CACHE = {}
+NAME_CACHE_MAX = 200_000
+
+
 def normalize_name(value: str) -> str:
     """Bersihkan nama nasabah dari gelar/akronim dan kapitalisasi."""
     if not value or pd.isna(value):
@@ -18,24 +47,35 @@ def normalize_name(value: str) -> str:
     text = str(value)
 
     # hapus kode/gelar umum
-    pattern = re.compile(
-        r"\b("
-        r"dr\.?|drs\.?|dr_?|prof\.?|ir\.?|h\.?|kh\.?|tgk\.?|r\.?|hr\.?|se\.?|kt\.?|mm\.?|s\.e\.?|m\.m\.?|"
-        r"s\.farm\.?|m\.farm\.?|s\.ked\.?|s\.kom\.?|m\.kom\.?|s\.si\.?|m\.si\.?|s\.pd\.?|m\.pd\.?|"
-        r"s\.os\.?|m\.os\.?|s\.gz\.?|s\.t\.?|m\.ak\.?|apt\.?|sp\.[a-z]*|spt|spd|"
-        r"[A-Z]\s+[A-Z]{1,3}"  # pola seperti M TI
-        r")\b",
-        flags=re.IGNORECASE
-    )
-
-    text = pattern.sub("", text)
+    text = _TITLE_RE.sub("", text)
     # rapikan spasi dan tanda baca
-    text = re.sub(r"[\"',.;:-]+", " ", text)
-    text = re.sub(r"\s+", " ", text).strip()
+    text = _PUNCT_RE.sub(" ", text)
+    text = _SPACE_RE.sub(" ", text).strip()
 
     return text.upper()
 
 
+def normalize_names(values: pd.Series) -> pd.Series:
+    """
+    Versi vektor normalize_name untuk satu kolom: hanya nama unik yang belum
+    ada di memo yang diproses (lewat accessor .str), lalu dipetakan balik.
+    """
+    if len(_NAME_CACHE) > NAME_CACHE_MAX:
+        _NAME_CACHE.clear()
+    todo = [v for v in pd.unique(values.dropna()) if v not in _NAME_CACHE]
+    if todo:
+        text = (
+            pd.Series(todo, dtype=object).astype(str)
+            .str.replace(_TITLE_RE, "", regex=True)
+            .str.replace(_PUNCT_RE, " ", regex=True)
+            .str.replace(_SPACE_RE, " ", regex=True)
+            .str.strip()
+            .str.upper()
+        )
+        _NAME_CACHE.update((v, t if v else "") for v, t in zip(todo, text))
+    return values.map(_NAME_CACHE).fillna("")
+
+
 def extract_first_phone(phone_str):
     """Ambil hanya nomor telepon pertama jika ada lebih dari satu."""
     if pd.isna(phone_str) or str(phone_str).strip() == "":
@@ -56,6 +96,14 @@ def extract_first_phone(phone_str):
     return first_phone if first_phone else None
 
 
+def extract_first_phones(values: pd.Series) -> pd.Series:
+    """Versi kolom extract_first_phone (kosong → None)."""
+    first = values.astype("string").str.strip().str.split(r"[;,]", n=1, regex=True).str[0].str.strip()
+    phone = first.str.extract(r"\b(08\d{8,13})\b", expand=False).fillna(first)
+    phone = phone.where(phone.ne(""))
+    return phone.astype(object).where(phone.notna(), None)
+
+
 def process_jatuh_tempo(df):
     """Proses data jatuh tempo dari CSV yang sudah terstruktur."""
     
@@ -66,16 +114,16 @@ def process_jatuh_tempo(df):
     df_out["NO_SBG"] = df["No_SBG"].astype(str).str.strip()
     
     # Nasabah - bersihkan nama dari gelar
-    df_out["NASABAH"] = df["Nasabah"].apply(normalize_name)
+    df_out["NASABAH"] = normalize_names(df["Nasabah"])
     
     # Telp_HP - ambil hanya nomor pertama
-    df_out["TELP_HP"] = df["Telp_HP"].apply(extract_first_phone)
+    df_out["TELP_HP"] = extract_first_phones(df["Telp_HP"])
     
     # Tgl_Jatuh_Tempo - format tanggal
     df_out["TGL_JATUH_TEMPO"] = df["Tgl_Jatuh_Tempo"].astype(str).str.strip()
     
     # Uang_Pinjaman - convert ke integer
-    df_out["UANG_PINJAMAN"] = df["Uang_Pinjaman"].apply(normalize_number)
+    df_out["UANG_PINJAMAN"] = normalize_numbers(df["Uang_Pinjaman"])
     
     # Drop record kosong (tanpa no_sbg atau nama nasabah)
     df_out = df_out[df_out["NO_SBG"].notna() & df_out["NO_SBG"].ne("")]
@@ -106,6 +154,14 @@ def extract_nasabah_kb(text: str):
     return normalize_name(nama)
 
 
+def extract_nasabah_kb_raw(texts: pd.Series) -> pd.Series:
+    """extract_nasabah_kb untuk satu kolom raw_text, tanpa normalize_name."""
+    texts = texts.astype(str)
+    texts = texts.str.replace(r"^\D*(\d\D*){16}", "", regex=True)
+    texts = texts.str.replace(r"^\s*\d{2}\s*\d{6,12}\s*", "", regex=True)
+    return texts.str.split(r"\d{2}-\d{2}-\d{4}", n=1, regex=True).str[0].str.strip()
+
+
 def extract_uang_pinjaman_kb(text: str):
     dates = re.findall(r"\d{2}-\d{2}-\d{4}", str(text))
     if len(dates) < 2:
@@ -125,14 +181,14 @@ def process_kredit_bermasalah(df: pd.DataFrame):
     if "raw_text" in df.columns:
         # Format lama (raw OCR)
         df["NO_KREDIT"] = df["raw_text"].apply(extract_no_kredit)
-        df["NASABAH"] = df["raw_text"].apply(extract_nasabah_kb)
+        df["NASABAH"] = normalize_names(extract_nasabah_kb_raw(df["raw_text"]))
         df["UANG_PINJAMAN"] = df["raw_text"].apply(extract_uang_pinjaman_kb)
     else:
         # Format baru (sudah terstruktur)
         df_out = pd.DataFrame()
         df_out["NO_KREDIT"] = df.get("No_Kredit", df.get("No_SBG", "")).astype(str).str.strip()
-        df_out["NASABAH"] = df["Nasabah"].apply(normalize_name)
-        df_out["UANG_PINJAMAN"] = df["Uang_Pinjaman"].apply(normalize_number)
+        df_out["NASABAH"] = normalize_names(df["Nasabah"])
+        df_out["UANG_PINJAMAN"] = normalize_numbers(df["Uang_Pinjaman"])
         
         # Drop record kosong
         df_out = df_out[df_out["NO_KREDIT"].notna() & df_out["NO_KREDIT"].ne("")]
@@ -148,20 +204,27 @@ def process_kredit_bermasalah(df: pd.DataFrame):
 
 
 # === Runner ===
+def postprocess_dataframe(df: pd.DataFrame, doc_type: str) -> pd.DataFrame:
+    """
+    Postprocessing DataFrame hasil OCR (kolom string, seperti dibaca dari CSV raw_ocr).
+    Dipakai run_postprocessing dan mode fused di pipeline (tanpa CSV perantara).
+    """
+    if doc_type == "jatuh_tempo" or "Tgl_Jatuh_Tempo" in df.columns:
+        return process_jatuh_tempo(df)
+    return process_kredit_bermasalah(df)
+
+
 def run_postprocessing(input_csv, output_csv):
-    """Jalankan postprocessing pada file CSV."""
+    """Jalankan postprocessing pada file artefak raw_ocr (CSV / Parquet)."""
     
-    df = pd.read_csv(input_csv, encoding="utf-8-sig", dtype=str)
+    df = read_artifact(input_csv, as_str=True)
     
     # Deteksi tipe data berdasarkan nama file atau kolom
-    if "jatuh_tempo" in os.path.basename(input_csv).lower() or "Tgl_Jatuh_Tempo" in df.columns:
-        df_out = process_jatuh_tempo(df)
-    else:
-        df_out = process_kredit_bermasalah(df)
+    doc_type = "jatuh_tempo" if "jatuh_tempo" in os.path.basename(input_csv).lower() else "kredit_bermasalah"
+    df_out = postprocess_dataframe(df, doc_type)
     
     # Simpan hasil
-    os.makedirs(os.path.dirname(output_csv), exist_ok=True)
-    df_out.to_csv(output_csv, index=False, encoding="utf-8-sig")
+    output_csv = save_artifact(df_out, output_csv, kind="postprocessed")
     print(f"[INFO] Hasil disimpan → {output_csv}")
     print(f"[INFO] Total record: {len(df_out)}")
     
@@ -169,13 +232,8 @@ def run_postprocessing(input_csv, output_csv):
 
 
 def latest_csv(prefix, raw_dir):
-    """Cari file CSV terbaru berdasarkan prefix."""
-    files = [
-        os.path.join(raw_dir, f)
-        for f in os.listdir(raw_dir)
-        if f.startswith(prefix) and f.endswith(".csv")
-    ]
-    return max(files, key=os.path.getmtime) if files else None
+    """Cari file artefak (CSV / Parquet) terbaru berdasarkan prefix."""
+    return latest_artifact(prefix, raw_dir)
 
 
 def run_postprocessing_wrapper(base_output_dir):
@@ -1,7 +1,11 @@
 import os
+import json
+import shutil
+import hashlib
 import cv2
 import numpy as np
-from pdf2image import convert_from_path
+from concurrent.futures import ThreadPoolExecutor
+from pdf2image import convert_from_path, pdfinfo_from_path
 
 # Folder dataset & output
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))  # root project
@@ -20,11 +24,38 @@ if os.name == "nt":  # Windows
 else:
     POPPLER_PATH = None  # Linux/Mac → pakai poppler dari packages.txt
 
+# Resolusi rasterisasi PDF & jumlah worker default untuk mode paralel
+RASTER_DPI = 300
+RASTER_WORKERS = max(1, min(4, os.cpu_count() or 1))
+# Jumlah halaman per window streaming (memori puncak ≈ workers × window)
+PAGE_WINDOW = 4
+
+# Cache hasil preprocessing per halaman (key: hash PDF + halaman + mode + parameter).
+# Sengaja di luar output/ supaya tidak ikut terhapus cleanup otomatis / halaman Hapus Data.
+CACHE_DIR = os.path.join(BASE_DIR, "cache")
+PAGE_CACHE_DIR = os.path.join(CACHE_DIR, "preprocessed")
+PAGE_CACHE_MAX_BYTES = 2 * 1024 ** 3  # batas ukuran cache, lebih dari ini → LRU eviction
+PREPROCESS_VERSION = 1  # naikkan jika algoritma preprocess_image berubah
+
+# Grid tabel jatuh_tempo untuk OCR per-sel (fraksi lebar halaman).
+# No_SBG & Nasabah mengikuti batas kolom Rubrik/Alamat di bawah; blok Telp+tanggal
+# dan blok nominal (Taksiran | Uang Pinjaman | SM) diambil utuh per baris lalu
+# dipecah dengan regex, karena batas kolom di dalamnya tidak tetap.
+JT_GRID_COLUMNS = {
+    "No_SBG": (0.04, 0.16),
+    "Nasabah": (0.21, 0.33),
+    "Telp_Tanggal": (0.33, 0.51),
+    "Nominal": (0.73, 1.00),
+}
+JT_HEADER_END = 0.26    # sama dengan remove_header_tabel
+JT_FOOTER_START = 0.92  # sama dengan remove_total_footer
+
 def get_table_rows(img):
     """
     Deteksi garis horizontal tabel untuk dapatkan koordinat baris (y).
+    img boleh BGR atau grayscale (hasil preprocess_image).
     """
-    gray = cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
+    gray = img if img.ndim == 2 else cv2.cvtColor(img, cv2.COLOR_BGR2GRAY)
     _, thresh = cv2.threshold(gray, 200, 255, cv2.THRESH_BINARY_INV)
 
     # Cari garis horizontal
@@ -41,6 +72,39 @@ def get_table_rows(img):
     rows = sorted(rows)
     return rows
 
+def get_table_row_bands(img, min_row_height=20):
+    """
+    Pasangan (y1, y2) untuk tiap baris data tabel jatuh_tempo.
+    Garis yang terpotong kolom putih menghasilkan beberapa kontur di y yang sama,
+    jadi y yang berdekatan (< min_row_height) digabung. Batas header & footer
+    ikut dipakai karena garisnya bisa ikut terhapus saat preprocessing.
+    """
+    h = img.shape[0]
+    ys = sorted(set(get_table_rows(img)) | {int(h * JT_HEADER_END), int(h * JT_FOOTER_START)})
+
+    lines = []
+    for y in ys:
+        if not lines or y - lines[-1] >= min_row_height:
+            lines.append(y)
+    return [(y1, y2) for y1, y2 in zip(lines, lines[1:])
+            if y1 >= int(h * JT_HEADER_END) and y2 <= int(h * JT_FOOTER_START)]
+
+
+def get_table_cells(img, columns=JT_GRID_COLUMNS, margin=3):
+    """
+    Potong grid tabel menjadi sel: list (index_baris, nama_kolom, [x1, x2, y1, y2]).
+    Format box mengikuti horizontal_list EasyOCR.
+    """
+    w = img.shape[1]
+    cells = []
+    for row_idx, (y1, y2) in enumerate(get_table_row_bands(img)):
+        for col, (f1, f2) in columns.items():
+            x1, x2 = int(w * f1) + margin, int(w * f2) - margin
+            if x2 > x1 and (y2 - margin) > (y1 + margin):
+                cells.append((row_idx, col, [x1, x2, y1 + margin, y2 - margin]))
+    return cells
+
+
 def remove_rubrik_column(img):
     """
     Hapus kolom Rubrik dari tabel (posisi tetap antara No. SBG dan Nasabah).
@@ -110,10 +174,27 @@ def remove_header_tabel(img):
 
     return img
 
-def preprocess_image(img, output_path, mode="normal", keep_aspect_ratio=True,
+def pil_to_bgr(page):
+    """Konversi halaman PIL (hasil pdf2image) → array BGR ala cv2.imread, tanpa encode PNG."""
+    return cv2.cvtColor(np.asarray(page.convert("RGB")), cv2.COLOR_RGB2BGR)
+
+
+def upscale_adaptive_threshold(gray, fx=2):
+    """Upscale (cubic) + adaptive threshold + opening; dipakai jatuh_tempo & re-OCR box."""
+    resized = cv2.resize(gray, None, fx=fx, fy=fx, interpolation=cv2.INTER_CUBIC)
+    thresh = cv2.adaptiveThreshold(
+        resized, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
+        cv2.THRESH_BINARY, 35, 11
+    )
+    kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
+    return cv2.morphologyEx(thresh, cv2.MORPH_OPEN, kernel)
+
+
+def preprocess_image(img, output_path=None, mode="normal", keep_aspect_ratio=True,
                      remove_rubrik=True, remove_barang=True, remove_alamat=True):
     """
     Preprocessing gambar agar lebih jelas untuk OCR.
+    Return array hasil binarisasi; disimpan ke output_path jika diberikan.
     """
     # Step 1: hapus kolom tertentu
     if remove_rubrik:
@@ -138,33 +219,222 @@ def preprocess_image(img, output_path, mode="normal", keep_aspect_ratio=True,
 
     # Thresholding
     if mode == "jatuh_tempo":
-        resized = cv2.resize(resized, None, fx=2, fy=2, interpolation=cv2.INTER_CUBIC)
-        thresh = cv2.adaptiveThreshold(
-            resized, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C,
-            cv2.THRESH_BINARY, 35, 11
-        )
-        kernel = cv2.getStructuringElement(cv2.MORPH_RECT, (2, 2))
-        cleaned = cv2.morphologyEx(thresh, cv2.MORPH_OPEN, kernel)
+        cleaned = upscale_adaptive_threshold(resized)
     else:
         _, cleaned = cv2.threshold(resized, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
 
-    cv2.imwrite(output_path, cleaned)
+    if output_path:
+        cv2.imwrite(output_path, cleaned)
+    return cleaned
+
+
+def get_page_count(pdf_path):
+    """Ambil jumlah halaman PDF via pdfinfo (tanpa rasterisasi)."""
+    info = pdfinfo_from_path(pdf_path, poppler_path=POPPLER_PATH)
+    return int(info["Pages"])
+
+
+def page_runs(pages, max_len=None):
+    """
+    Kelompokkan nomor halaman (urut) menjadi rentang (first_page, last_page)
+    yang berurutan, masing-masing maksimal max_len halaman.
+    """
+    runs = []
+    for p in pages:
+        if runs and p == runs[-1][1] + 1 and (not max_len or p - runs[-1][0] < max_len):
+            runs[-1][1] = p
+        else:
+            runs.append([p, p])
+    return [tuple(r) for r in runs]
+
+
+# === Cache preprocessing ===
+def file_sha256(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def page_cache_key(pdf_hash, page_no, mode, params):
+    raw = json.dumps([pdf_hash, page_no, mode, params, PREPROCESS_VERSION], sort_keys=True)
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
 
 
-def pdf_to_images(pdf_path, output_folder, prefix="file", mode="normal", keep_aspect_ratio=True):
-    pages = convert_from_path(pdf_path, dpi=300, poppler_path=POPPLER_PATH)
+def _page_cache_path(key):
+    return os.path.join(PAGE_CACHE_DIR, f"{key}.png")
+
+
+def load_cached_page(key, output_path=None):
+    """
+    Ambil halaman dari cache (None jika tidak ada).
+    output_path → file cache disalin apa adanya (tanpa decode) dan path-nya dikembalikan;
+    selain itu return array grayscale.
+    """
+    cache_path = _page_cache_path(key)
+    if not os.path.exists(cache_path):
+        return None
+    os.utime(cache_path)  # tandai baru dipakai (LRU)
+    if output_path:
+        shutil.copyfile(cache_path, output_path)
+        return output_path
+    return cv2.imread(cache_path, cv2.IMREAD_GRAYSCALE)
+
+
+def store_cached_page(key, page_path=None, img=None):
+    """Simpan hasil preprocessing ke cache (salin file jika sudah ditulis, jika tidak encode array)."""
+    os.makedirs(PAGE_CACHE_DIR, exist_ok=True)
+    cache_path = _page_cache_path(key)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp.png"
+    if page_path:
+        shutil.copyfile(page_path, tmp_path)
+    else:
+        cv2.imwrite(tmp_path, img)
+    os.replace(tmp_path, cache_path)
+
+
+def evict_page_cache(max_bytes=PAGE_CACHE_MAX_BYTES):
+    """Hapus file cache yang paling lama tidak dipakai sampai total ukuran <= max_bytes."""
+    if not os.path.isdir(PAGE_CACHE_DIR):
+        return 0
+    entries = []
+    for name in os.listdir(PAGE_CACHE_DIR):
+        path = os.path.join(PAGE_CACHE_DIR, name)
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            continue
+        entries.append((st.st_mtime, st.st_size, path))
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        try:
+            os.remove(path)
+            total -= size
+            removed += 1
+        except OSError as e:
+            print(f"[WARN] Gagal hapus cache {path}: {e}")
+    return removed
+
+
+def _convert_page_range(pdf_path, output_folder, prefix, first_page, last_page,
+                        mode="normal", keep_aspect_ratio=True, write_images=True,
+                        cache_keys=None):
+    """
+    Render satu rentang halaman, preprocess tiap halaman langsung dari memori,
+    lalu lepas halaman PIL-nya.
+    Return list (nomor_halaman, hasil) dengan hasil = path gambar (write_images=True)
+    atau (nama_file, array).
+    """
+    pages = convert_from_path(
+        pdf_path, dpi=RASTER_DPI, poppler_path=POPPLER_PATH,
+        first_page=first_page, last_page=last_page
+    )
+
+    results = []
+    for offset, page in enumerate(pages):
+        page_no = first_page + offset
+        fname = f"{prefix}_page{page_no}.png"
+        img = pil_to_bgr(page)
+        page.close()
+
+        key = cache_keys.get(page_no) if cache_keys else None
+        if write_images:
+            page_path = os.path.join(output_folder, fname)
+            preprocess_image(img, page_path, mode=mode, keep_aspect_ratio=keep_aspect_ratio)
+            if key:
+                store_cached_page(key, page_path=page_path)
+            results.append((page_no, page_path))
+        else:
+            cleaned = preprocess_image(img, mode=mode, keep_aspect_ratio=keep_aspect_ratio)
+            if key:
+                store_cached_page(key, img=cleaned)
+            results.append((page_no, (fname, cleaned)))
+
+    del pages
+    return results
+
+
+def pdf_to_images(pdf_path, output_folder, prefix="file", mode="normal", keep_aspect_ratio=True,
+                  workers=1, window_size=PAGE_WINDOW, write_images=True, use_cache=True):
+    """
+    Konversi PDF → gambar hasil preprocessing ({prefix}_page{N}.png).
+    - window_size: halaman dirender per window kecil; tiap window di-preprocess,
+      disimpan dan dilepas sebelum window berikutnya diambil, sehingga memori
+      puncak tidak bergantung pada jumlah halaman PDF.
+      None → tanpa streaming (semua halaman sekaligus / dibagi rata per worker).
+    - workers > 1: beberapa window dirender paralel, masing-masing oleh
+      proses pdftoppm sendiri.
+    - write_images=False: tidak ada yang ditulis ke disk; return list
+      (nama_file, array) untuk langsung diteruskan ke tahap OCR.
+    - use_cache: halaman yang sudah ada di cache (PDF, halaman, mode & parameter
+      sama) diambil dari cache tanpa rasterisasi ulang.
+    Return list hasil per halaman, urut nomor halaman.
+    """
+    results = []
+    cache_keys = {}
+    if use_cache or window_size or workers > 1:
+        todo = list(range(1, get_page_count(pdf_path) + 1))
+    else:
+        todo = None
+
+    if use_cache:
+        pdf_hash = file_sha256(pdf_path)
+        params = {"dpi": RASTER_DPI, "keep_aspect_ratio": keep_aspect_ratio}
+        missing = []
+        for page_no in todo:
+            key = page_cache_key(pdf_hash, page_no, mode, params)
+            fname = f"{prefix}_page{page_no}.png"
+            out_path = os.path.join(output_folder, fname) if write_images else None
+            cached = load_cached_page(key, out_path)
+            if cached is None:
+                cache_keys[page_no] = key
+                missing.append(page_no)
+            else:
+                results.append((page_no, cached if write_images else (fname, cached)))
+        if results:
+            print(f"[INFO] {len(results)} halaman diambil dari cache preprocessing")
+        todo = missing
+
+    if todo is None:
+        # last_page=None → render semua halaman dalam satu panggilan
+        ranges = [(1, None)]
+    elif window_size:
+        ranges = page_runs(todo, window_size)
+    elif workers > 1:
+        ranges = page_runs(todo, -(-len(todo) // workers))
+    else:
+        ranges = page_runs(todo)
+
+    def convert(page_range):
+        first, last = page_range
+        return _convert_page_range(pdf_path, output_folder, prefix, first, last,
+                                   mode, keep_aspect_ratio, write_images, cache_keys)
 
-    for i, page in enumerate(pages):
-        page_path = os.path.join(output_folder, f"{prefix}_page{i+1}.png")
-        page.save(page_path, "PNG")
+    if workers > 1 and len(ranges) > 1:
+        # Worker hanya mengembalikan hasil akhir → paling banyak `workers` window PIL di memori
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            chunks = list(executor.map(convert, ranges))
+    else:
+        chunks = [convert(r) for r in ranges]
+    for chunk in chunks:
+        results.extend(chunk)
+    results = [item for _, item in sorted(results, key=lambda r: r[0])]
 
-        img = cv2.imread(page_path)
-        preprocess_image(img, page_path, mode=mode, keep_aspect_ratio=keep_aspect_ratio)
+    if cache_keys:
+        evict_page_cache()
 
-    print(f"[INFO] {pdf_path} berhasil dikonversi ke {len(pages)} gambar (mode={mode}).")
+    print(f"[INFO] {pdf_path} berhasil dikonversi ke {len(results)} gambar "
+          f"(mode={mode}, workers={workers}, window={window_size}).")
+    return results
 
 
-def process_all_pdfs(keep_aspect_ratio=True):
+def process_all_pdfs(keep_aspect_ratio=True, workers=RASTER_WORKERS, window_size=PAGE_WINDOW,
+                     use_cache=True):
     folder_mapping = {
         "Dataset Daftar Kredit Bermasalah": ("kredit_bermasalah",),
         "Dataset Daftar Kredit Jatuh Tempo": ("jatuh_tempo",),
@@ -180,15 +450,28 @@ def process_all_pdfs(keep_aspect_ratio=True):
                 pdf_path = os.path.join(input_dir, pdf_file)
                 prefix = os.path.splitext(pdf_file)[0]
                 pdf_to_images(pdf_path, output_dir, prefix,
-                              mode=mode, keep_aspect_ratio=keep_aspect_ratio)
+                              mode=mode, keep_aspect_ratio=keep_aspect_ratio,
+                              workers=workers, window_size=window_size,
+                              use_cache=use_cache)
 
 
-def run_preprocessing(pdf_path, doc_type, base_output_dir, keep_aspect_ratio=True):
+def run_preprocessing(pdf_path, doc_type, base_output_dir, keep_aspect_ratio=True,
+                      workers=RASTER_WORKERS, window_size=PAGE_WINDOW, write_images=True,
+                      use_cache=True):
+    """
+    Preprocessing satu PDF untuk doc_type.
+    write_images=False → return list (nama_file, array) tanpa menulis ke images/.
+    """
     output_dir = os.path.join(base_output_dir, "images", doc_type)
     os.makedirs(output_dir, exist_ok=True)
 
     prefix = os.path.splitext(os.path.basename(pdf_path))[0]
-    pdf_to_images(pdf_path, output_dir, prefix, mode=doc_type, keep_aspect_ratio=keep_aspect_ratio)
+    results = pdf_to_images(pdf_path, output_dir, prefix, mode=doc_type,
+                            keep_aspect_ratio=keep_aspect_ratio, workers=workers,
+                            window_size=window_size, write_images=write_images,
+                            use_cache=use_cache)
+    if not write_images:
+        return results
 
     files = [
         os.path.join(output_dir, f)
@@ -0,0 +1,126 @@
+import re
+from collections import namedtuple
+
+# === Parser record jatuh_tempo ===
+# Satu record di-tokenize sekali (satu finditer dengan pola yang sudah di-compile)
+# menjadi token bertipe, lalu semua field diturunkan dari token stream yang sama.
+
+Token = namedtuple("Token", ["kind", "text", "start", "end"])
+
+SBG, PHONE, DATE, AMOUNT, NUM, WORD, TOTAL = "SBG", "PHONE", "DATE", "AMOUNT", "NUM", "WORD", "TOTAL"
+
+_TOKEN_RE = re.compile(
+    r"(?P<date>\b\d{2}-\d{2}-\d{4}\b)"
+    r"|(?P<amount>\d{1,3}(?:[.,]\d{3})+)"
+    r"|(?P<digits>\d+)"
+    r"|(?P<word>[A-Za-z]+)"
+)
+_PHONE_RE = re.compile(r"08\d{8,11}")
+_TOTAL_RE = re.compile(r"TOTAL", re.IGNORECASE)
+_NAME_JUNK_RE = re.compile(r"[^0-9A-Za-z\s\.,\-:\/]")
+_SPACE_RE = re.compile(r"\s+")
+_EDGE_PUNCT_RE = re.compile(r"^[\W_]+|[\W_]+$")
+# Batas akhir nama: telepon, tanggal, atau angka ribuan. Sengaja tidak di-anchor ke
+# token (sama seperti ekstraksi lama): "1234.567" memotong nama di "234.567".
+_NAME_STOP_RE = re.compile(r"08\d{8,11}|\b\d{2}-\d{2}-\d{4}\b|\d{1,3}[.,]\d{3}")
+
+# Angka TOTAL yang diketahui (dari page 9) → bukan nominal record
+TOTAL_VALUES = {901392824, 781774200, 66871800}
+
+
+class JatuhTempoRecordParser:
+    """
+    Ekstrak field jatuh_tempo (No_SBG, Nasabah, Telp_HP, tanggal, nominal)
+    dari satu record teks OCR.
+    """
+
+    def tokenize(self, text: str):
+        tokens = []
+        for m in _TOKEN_RE.finditer(text or ""):
+            kind, value = m.lastgroup, m.group()
+            if kind == "date":
+                kind = DATE
+            elif kind == "amount":
+                kind = AMOUNT
+            elif kind == "digits":
+                if 15 <= len(value) <= 16:
+                    kind = SBG
+                elif _PHONE_RE.search(value):
+                    kind = PHONE
+                else:
+                    kind = NUM
+            else:
+                kind = TOTAL if _TOTAL_RE.search(value) else WORD
+            tokens.append(Token(kind, value, m.start(), m.end()))
+        return tokens
+
+    def no_sbg(self, tokens) -> str:
+        return next((t.text for t in tokens if t.kind == SBG), "")
+
+    def nasabah(self, tokens, text: str) -> str:
+        """Teks setelah No_SBG sampai sebelum telepon / tanggal / angka ribuan."""
+        idx = next((i for i, t in enumerate(tokens) if t.kind == SBG), None)
+        if idx is None:
+            return ""
+        start = tokens[idx].end
+        stop = _NAME_STOP_RE.search(text, start)
+        end = stop.start() if stop else len(text)
+        nama = _NAME_JUNK_RE.sub(" ", text[start:end])
+        nama = _SPACE_RE.sub(" ", nama).strip()
+        return _EDGE_PUNCT_RE.sub("", nama).strip()
+
+    def phones(self, tokens) -> str:
+        """Nomor 08xxx (10-13 digit) di luar No_SBG, digabung '; '."""
+        telps = {p for t in tokens if t.kind == PHONE for p in _PHONE_RE.findall(t.text)}
+        return "; ".join(sorted(telps))
+
+    def dates(self, tokens) -> tuple:
+        tgls = [t.text for t in tokens if t.kind == DATE]
+        return (tgls[0] if tgls else "", tgls[1] if len(tgls) > 1 else "")
+
+    def amounts(self, tokens) -> tuple:
+        """
+        Tiga angka nominal terakhir sebelum TOTAL: (taksiran, uang_pinjaman, sm).
+        Dibuang: 16 digit (No_SBG), 4 digit (tahun), range nomor HP, angka TOTAL,
+        dan nilai di luar 100 .. < 1 miliar.
+        """
+        vals = []
+        for t in tokens:
+            if t.kind == TOTAL:
+                break
+            if t.kind not in (AMOUNT, NUM, PHONE, SBG):
+                continue
+            digits = t.text.replace(",", "").replace(".", "")
+            if len(digits) < 3 or len(digits) in (4, 16):
+                continue
+            val = int(digits)
+            if 800_000_000 <= val <= 900_000_000_000 or val in TOTAL_VALUES:
+                continue
+            if 100 <= val < 1_000_000_000:
+                vals.append(val)
+
+        if len(vals) >= 3:
+            return (vals[-3], vals[-2], vals[-1])
+        if len(vals) == 2:
+            return (vals[-2], vals[-1], 0)
+        if len(vals) == 1:
+            return (0, 0, vals[-1])
+        return (0, 0, 0)
+
+    def parse(self, text: str) -> dict:
+        tokens = self.tokenize(text)
+        tgl_kredit, tgl_jt = self.dates(tokens)
+        taksiran, uang_pinjaman, sm = self.amounts(tokens)
+        return {
+            "No_SBG": self.no_sbg(tokens),
+            "Nasabah": self.nasabah(tokens, text),
+            "Telp_HP": self.phones(tokens),
+            "Tgl_Kredit": tgl_kredit,
+            "Tgl_Jatuh_Tempo": tgl_jt,
+            "Taksiran": taksiran,
+            "Uang_Pinjaman": uang_pinjaman,
+            "SM": sm,
+        }
+
+
+JT_PARSER = JatuhTempoRecordParser()
@@ -1,14 +1,17 @@
-import json
 import pandas as pd
 from datetime import datetime
 import os
+import sys
 import urllib.parse
 
-TEMPLATE_FILE = os.path.join("config", "templates.json")
+sys.path.append(os.path.dirname(os.path.dirname(__file__)))
+from utils import config_loader
+
+TEMPLATE_FILE = config_loader.TEMPLATES_PATH
 
 def load_templates():
-    with open(TEMPLATE_FILE, encoding="utf-8") as f:
-        return json.load(f)
+    """Template ter-cache; dibaca ulang hanya jika templates.json berubah."""
+    return config_loader.load_templates()
 
 def generate_messages(df: pd.DataFrame, doc_type: str, template_override=None):
     templates = load_templates()